@@ -0,0 +1,291 @@
+"""
+Load test of the HTTP API with yfinance, Twitter and Gemini stubbed out.
+
+Starts benchmarks.stubbed_app under uvicorn once per worker count, drives
+a weighted mix of requests over the routes in main.py from concurrent
+client threads for a fixed duration, and reports throughput, latency
+percentiles and error rates per route and worker count. Results are
+written to outputs/benchmarks/loadtest_<timestamp>.json.
+
+    cd backend
+    python -m benchmarks.load_test --workers 1 2 4 --concurrency 16 --duration 30
+    python -m benchmarks.load_test --mix heavy --weights "POST /next_day_pred=10" --subscribers 20
+
+Like run_benchmarks, the server runs inside a temporary copy of data/,
+models/, financial_signals/ and outputs/.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import requests
+
+from benchmarks.run_benchmarks import RESULTS_FOLDER, _git_commit, prepare_workspace
+from benchmarks.stubs import BACKEND_DIR, DEFAULT_ROWS
+
+DEFAULT_TICKERS = ["RELIANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS"]  # Tickers with fixtures in the workspace
+STARTUP_TIMEOUT_SECONDS = 180
+REQUEST_TIMEOUT_SECONDS = 120
+
+# name: (method, path, json body); {ticker} and {job_id} are filled in per request
+ROUTES = {
+    "GET /": ("GET", "/", None),
+    "GET /metrics": ("GET", "/metrics", None),
+    "POST /backtestingSignals/": ("POST", "/backtestingSignals/", {"ticker": "{ticker}"}),
+    "POST /backtest-jobs/": ("POST", "/backtest-jobs/", {"tickers": ["{ticker}"]}),
+    "GET /backtest-jobs/{job_id}": ("GET", "/backtest-jobs/{job_id}", None),
+    "GET /backtest-jobs/{job_id}/results": ("GET", "/backtest-jobs/{job_id}/results", None),
+    "POST /next_day_pred": ("POST", "/next_day_pred", {"ticker": "{ticker}"}),
+    "POST /multi_day_pred": ("POST", "/multi_day_pred", {"ticker": "{ticker}", "horizon": 5}),
+    "GET /model-metadata/": ("GET", "/model-metadata/", None),
+    "GET /model-metadata/{ticker}": ("GET", "/model-metadata/{ticker}", None),
+    "GET /get-financial-data/{ticker}": ("GET", "/get-financial-data/{ticker}", None),
+    "POST /fetch-data": ("POST", "/fetch-data", {"ticker": "{ticker}"}),
+    "POST /fetch-data/bulk": ("POST", "/fetch-data/bulk", {"tickers": ["{ticker}", "{ticker2}"]}),
+    "POST /prefetch": ("POST", "/prefetch", None),
+    "GET /prefetch": ("GET", "/prefetch", None),
+    "GET /screener/": ("GET", "/screener/?technical=buy&sort_by=upside_pct&descending=true", None),
+    "GET /sentiment-and-tweets/{ticker}/": ("GET", "/sentiment-and-tweets/{ticker}/", None),
+    "POST /get-plot-data/": ("POST", "/get-plot-data/", {"ticker": "{ticker}"}),
+    "GET /profiles/": ("GET", "/profiles/", None),
+}
+
+# Relative request weights; GET /stream/signals is exercised with --subscribers instead
+MIXES = {
+    "dashboard": {
+        "GET /": 1, "POST /next_day_pred": 4, "POST /multi_day_pred": 2, "GET /model-metadata/{ticker}": 1,
+        "GET /get-financial-data/{ticker}": 2, "POST /fetch-data": 3, "GET /sentiment-and-tweets/{ticker}/": 3,
+        "POST /get-plot-data/": 2, "GET /screener/": 4, "GET /backtest-jobs/{job_id}": 1, "GET /metrics": 1,
+    },
+    "heavy": {
+        "POST /backtestingSignals/": 2, "POST /next_day_pred": 2, "POST /multi_day_pred": 2,
+        "POST /get-plot-data/": 2, "POST /fetch-data/bulk": 1, "POST /backtest-jobs/": 1,
+    },
+    "all": {name: 1 for name in ROUTES},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _fill(value, ticker: str, ticker2: str, job_id: str):
+    if isinstance(value, str):
+        return value.format(ticker=ticker, ticker2=ticker2, job_id=job_id)
+    if isinstance(value, list):
+        return [_fill(v, ticker, ticker2, job_id) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, ticker, ticker2, job_id) for k, v in value.items()}
+    return value
+
+
+def start_server(workspace: str, workers: int, port: int, rows: int) -> subprocess.Popen:
+    """Run the stubbed app under uvicorn and wait until it answers GET /."""
+    pythonpath = os.pathsep.join(path for path in (BACKEND_DIR, os.environ.get("PYTHONPATH")) if path)
+    env = dict(os.environ, PYTHONPATH=pythonpath, LOADTEST_ROWS=str(rows), LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.stubbed_app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=workspace, env=env,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode} during startup")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/", timeout=2).ok:
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_server(server)
+    raise RuntimeError(f"Server did not start within {STARTUP_TIMEOUT_SECONDS}s")
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def _subscriber(base_url: str, tickers, stop: threading.Event, counts: dict, lock: threading.Lock):
+    """Hold a /stream/signals connection open and count the events pushed to it."""
+    try:
+        with requests.get(f"{base_url}/stream/signals", params={"tickers": ",".join(tickers)},
+                          stream=True, timeout=(5, 30)) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if line and line.startswith("event:"):
+                    with lock:
+                        counts["events"] += 1
+                if stop.is_set():
+                    break
+    except requests.RequestException:
+        if not stop.is_set():  # The server shutting down at the end of the run is expected
+            with lock:
+                counts["errors"] += 1
+
+
+def drive(base_url: str, weights: dict, tickers, concurrency: int, duration: float, seed: int, job_id: str):
+    """Send weighted random requests from `concurrency` threads for `duration` seconds; returns samples."""
+    names = list(weights)
+    cumulative = np.cumsum([weights[name] for name in names]).tolist()
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        rng = random.Random(seed + index)
+        session = requests.Session()
+        samples = []
+        while time.monotonic() < deadline:
+            name = rng.choices(names, cum_weights=cumulative)[0]
+            method, path, body = ROUTES[name]
+            ticker, ticker2 = rng.choice(tickers), rng.choice(tickers)
+            start = time.perf_counter()
+            try:
+                response = session.request(
+                    method, base_url + _fill(path, ticker, ticker2, job_id),
+                    json=_fill(body, ticker, ticker2, job_id), timeout=REQUEST_TIMEOUT_SECONDS,
+                )
+                status = response.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            samples.append((name, status, time.perf_counter() - start))
+        return samples
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return [sample for samples in executor.map(client, range(concurrency)) for sample in samples]
+
+
+def summarize(samples, duration: float):
+    """Per-route and overall throughput, latency percentiles and error rate."""
+    by_route = {}
+    for name, status, latency in samples:
+        by_route.setdefault(name, []).append((status, latency))
+    by_route["ALL"] = [(status, latency) for _, status, latency in samples]
+
+    summary = {}
+    for name, route_samples in by_route.items():
+        latencies_ms = np.array([latency for _, latency in route_samples]) * 1000
+        errors = sum(1 for status, _ in route_samples if not (isinstance(status, int) and status < 400))
+        summary[name] = {
+            "requests": len(route_samples),
+            "errors": errors,
+            "error_rate": errors / len(route_samples),
+            "throughput_per_s": len(route_samples) / duration,
+            "p50_ms": float(np.percentile(latencies_ms, 50)),
+            "p90_ms": float(np.percentile(latencies_ms, 90)),
+            "p99_ms": float(np.percentile(latencies_ms, 99)),
+            "max_ms": float(latencies_ms.max()),
+        }
+    return summary
+
+
+def run(workspace: str, workers: int, args, weights: dict) -> dict:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(workspace, workers, port, args.rows)
+    stop, lock = threading.Event(), threading.Lock()
+    stream_counts = {"events": 0, "errors": 0}
+    try:
+        # A job for the /backtest-jobs/{job_id} routes to poll
+        job_id = requests.post(f"{base_url}/backtest-jobs/", json={"tickers": args.tickers[:1]},
+                               timeout=REQUEST_TIMEOUT_SECONDS).json().get("job_id", "0" * 32)
+
+        if args.warmup:
+            drive(base_url, weights, args.tickers, args.concurrency, args.warmup, args.seed, job_id)
+
+        subscribers = [
+            threading.Thread(target=_subscriber, args=(base_url, args.tickers, stop, stream_counts, lock), daemon=True)
+            for _ in range(args.subscribers)
+        ]
+        for subscriber in subscribers:
+            subscriber.start()
+
+        started = time.monotonic()
+        samples = drive(base_url, weights, args.tickers, args.concurrency, args.duration, args.seed, job_id)
+        elapsed = time.monotonic() - started
+    finally:
+        stop.set()
+        stop_server(server)
+
+    routes = summarize(samples, elapsed)
+    for name in sorted(routes, key=lambda n: (n == "ALL", n)):
+        r = routes[name]
+        print(f"[workers={workers}] {name:<40} {r['requests']:>6} req {r['throughput_per_s']:>8.1f}/s "
+              f"p50={r['p50_ms']:>8.1f}ms p90={r['p90_ms']:>8.1f}ms p99={r['p99_ms']:>8.1f}ms "
+              f"errors={r['error_rate']:.1%}", flush=True)
+    if args.subscribers:
+        print(f"[workers={workers}] GET /stream/signals x{args.subscribers}: "
+              f"{stream_counts['events']} events, {stream_counts['errors']} connection errors", flush=True)
+    return {"workers": workers, "duration_s": elapsed, "routes": routes,
+            "stream": dict(stream_counts, subscribers=args.subscribers)}
+
+
+def parse_weights(mix: str, overrides) -> dict:
+    weights = dict(MIXES[mix])
+    for override in overrides or []:
+        name, _, weight = override.rpartition("=")
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route '{name}', expected one of {list(ROUTES)}")
+        weights[name] = float(weight)
+    weights = {name: weight for name, weight in weights.items() if weight > 0}
+    if not weights:
+        raise SystemExit("Traffic mix has no routes with a positive weight")
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API against stubbed external services")
+    parser.add_argument("--workers", nargs="*", type=int, default=[1, 2, 4], help="uvicorn worker counts to test")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds per worker count")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds of traffic before each run")
+    parser.add_argument("--mix", choices=list(MIXES), default="dashboard")
+    parser.add_argument("--weights", nargs="*", help='Override route weights, e.g. "POST /next_day_pred=10"')
+    parser.add_argument("--tickers", nargs="*", default=DEFAULT_TICKERS)
+    parser.add_argument("--subscribers", type=int, default=0, help="Concurrent /stream/signals connections")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Synthetic OHLCV history rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Results JSON path (default: outputs/benchmarks/loadtest_<timestamp>.json)")
+    args = parser.parse_args()
+    weights = parse_weights(args.mix, args.weights)
+
+    workspace = prepare_workspace()
+    try:
+        runs = [run(workspace, workers, args, weights) for workers in args.workers]
+    finally:
+        os.chdir(BACKEND_DIR)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "cpu_count": os.cpu_count(),
+        "mix": weights,
+        "concurrency": args.concurrency,
+        "tickers": args.tickers,
+        "rows": args.rows,
+        "runs": runs,
+    }
+    output = args.output or os.path.join(RESULTS_FOLDER, f"loadtest_{datetime.now().strftime('%Y%m%d%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Offline benchmark suite for the backend hot paths.
+
+Runs every core function and API route against the CSV/JSON data in
+backend/ with yfinance, Twitter and Gemini stubbed out (see stubs.py),
+at several OHLCV history sizes, and writes latency, throughput and peak
+Python memory per case to outputs/benchmarks/bench_<timestamp>.json.
+
+    cd backend
+    python -m benchmarks.run_benchmarks --sizes 250 1000 4000 --repeats 5
+    python -m benchmarks.run_benchmarks --compare outputs/benchmarks/bench_<old>.json
+
+The suite runs inside a temporary copy of data/, models/, financial_signals/
+and outputs/, so the files endpoints write during a run never touch the repo.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.stubs import BACKEND_DIR, FakeTicker, install_stubs
+
+DEFAULT_SIZES = [250, 1000, 4000]
+DEFAULT_TICKER = "RELIANCE.NS"
+RESULTS_FOLDER = os.path.join(BACKEND_DIR, "outputs", "benchmarks")
+WORKSPACE_FOLDERS = ["data", "models", "financial_signals", "outputs"]
+
+
+def prepare_workspace() -> str:
+    """Copy the backend's data folders to a temp dir and chdir into it."""
+    workspace = tempfile.mkdtemp(prefix="shankh-bench-")
+    for folder in WORKSPACE_FOLDERS:
+        source = os.path.join(BACKEND_DIR, folder)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(workspace, folder), ignore=shutil.ignore_patterns("benchmarks"))
+    os.chdir(workspace)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    return workspace
+
+
+def reset_caches():
+    """
+    Drop the in-process and on-disk caches built from earlier prices, so
+    each history size is measured from the same cold start instead of
+    reusing frames built at the previous size.
+    """
+    from src import feature_store, quarterly_features, unified_frame
+    unified_frame._entries.clear()
+    unified_frame._quarter_entries.clear()
+    with feature_store._lock:
+        feature_store._memory_cache.clear()
+    quarterly_features._materialized.clear()
+    shutil.rmtree(feature_store.FEATURE_CACHE_FOLDER, ignore_errors=True)
+    shutil.rmtree(quarterly_features.QUARTERLY_CACHE_FOLDER, ignore_errors=True)
+
+
+def build_cases(ticker: str):
+    """(name, kind, callable, setup) for every function and route under test."""
+    from fastapi.testclient import TestClient
+
+    import main
+    from src.backtesting_signals import get_stocks_data, technical_predictions, next_day_pred, multi_horizon_pred
+    from src.data_fetcher import fetch_stock_data
+    from src.feature_store import build_indicator_frame
+    from src.financial_data_fetcher import fetch_financial_data
+    from src.financial_graph import get_plot_data
+
+    company_name = ticker.split(".")[0]
+    quarterly_file_path = f"data/Quartely_merged/{company_name}_Final_merged.csv"
+    start_date, end_date = datetime(2021, 7, 7), datetime.today()
+    client = TestClient(main.app)
+    twitter_client = main.twitter_client
+
+    def ohlcv():
+        return get_stocks_data(ticker, start_date, end_date)
+
+    def call(method, url, **kwargs):
+        def _call():
+            response = client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        return _call
+
+    def clear_tweet_cache():
+        twitter_client.tweet_cache.clear()
+
+    return [
+        ("get_stocks_data", "function", ohlcv, None),
+        ("build_indicator_frame", "function", lambda: build_indicator_frame(ohlcv().set_index('Date')), None),
+        ("technical_predictions", "function", lambda: technical_predictions(ticker, ohlcv()), None),
+        ("next_day_pred", "function", lambda: next_day_pred(ticker), None),
+        ("multi_horizon_pred", "function", lambda: multi_horizon_pred(ticker, 5), None),
+        ("fetch_stock_data", "function", lambda: fetch_stock_data(ticker), None),
+        ("fetch_financial_data", "function", lambda: fetch_financial_data(ticker), None),
+        ("get_plot_data", "function", lambda: get_plot_data(ticker, quarterly_file_path), None),
+        ("sentiment_cold", "function", lambda: twitter_client.get_sentiment_and_tweets(ticker), clear_tweet_cache),
+        ("sentiment_warm", "function", lambda: twitter_client.get_sentiment_and_tweets(ticker), None),
+        ("GET /", "endpoint", call("GET", "/"), None),
+        ("POST /backtestingSignals/", "endpoint", call("POST", "/backtestingSignals/", json={"ticker": ticker}), None),
+        ("POST /next_day_pred", "endpoint", call("POST", "/next_day_pred", json={"ticker": ticker}), None),
+        ("POST /multi_day_pred", "endpoint", call("POST", "/multi_day_pred", json={"ticker": ticker, "horizon": 5}), None),
+        ("GET /model-metadata/", "endpoint", call("GET", "/model-metadata/"), None),
+        ("GET /get-financial-data/{ticker}", "endpoint", call("GET", f"/get-financial-data/{ticker}"), None),
+        ("POST /fetch-data", "endpoint", call("POST", "/fetch-data", json={"ticker": ticker}), None),
+        ("GET /sentiment-and-tweets/{ticker}/", "endpoint", call("GET", f"/sentiment-and-tweets/{ticker}/"), clear_tweet_cache),
+        ("POST /get-plot-data/", "endpoint", call("POST", "/get-plot-data/", json={"ticker": ticker}), None),
+    ]
+
+
+def measure(fn, setup=None, repeats: int = 5, warmup: int = 1):
+    """Latency stats over `repeats` timed calls plus peak traced memory of one extra call."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    latencies = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+
+    # Measured separately: tracemalloc slows allocation-heavy code down
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "n": repeats,
+        "mean_ms": float(latencies_ms.mean()),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "min_ms": float(latencies_ms.min()),
+        "max_ms": float(latencies_ms.max()),
+        "throughput_per_s": float(repeats / sum(latencies)),
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def run(sizes, repeats: int, ticker: str, only=None):
+    results = []
+    cases = build_cases(ticker)
+    for size in sizes:
+        FakeTicker.rows = size
+        reset_caches()
+        for name, kind, fn, setup in cases:
+            if only and not any(pattern in name for pattern in only):
+                continue
+            record = {"name": name, "kind": kind, "size": size}
+            try:
+                record.update(measure(fn, setup, repeats=repeats))
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            results.append(record)
+            summary = f"p50={record['p50_ms']:.1f}ms" if "p50_ms" in record else record["error"]
+            print(f"[{size:>5}] {name:<40} {summary}", flush=True)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current, baseline_path: str, threshold: float) -> int:
+    """Print p50 ratios against a previous results file; returns the number of regressions."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparison with {baseline_path} (regression threshold +{threshold:.0%})")
+    for record in current:
+        previous = baseline.get((record["name"], record["size"]))
+        if not previous or "p50_ms" not in previous or "p50_ms" not in record:
+            continue
+        ratio = record["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else float("inf")
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"[{record['size']:>5}] {record['name']:<40} {previous['p50_ms']:>9.1f}ms -> {record['p50_ms']:>9.1f}ms "
+              f"x{ratio:.2f} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend hot paths offline")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="OHLCV history rows per case")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--ticker", default=DEFAULT_TICKER)
+    parser.add_argument("--only", nargs="*", help="Run only cases whose name contains one of these strings")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: outputs/benchmarks/bench_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative p50 slowdown counted as a regression")
+    args = parser.parse_args()
+
+    workspace = prepare_workspace()
+    try:
+        with install_stubs():
+            results = run(args.sizes, args.repeats, args.ticker, args.only)
+    finally:
+        os.chdir(BACKEND_DIR)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "ticker": args.ticker,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_FOLDER, f"bench_{datetime.now().strftime('%Y%m%d%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+The FastAPI app with yfinance, Twitter and Gemini replaced by the stubs in
+stubs.py, for running under a real server:
+
+    cd <workspace with data/, models/, financial_signals/, outputs/>
+    PYTHONPATH=<backend> uvicorn benchmarks.stubbed_app:app --workers 4
+
+Each uvicorn worker imports this module, so every worker process is
+stubbed, and backtest jobs install the stubs in their pool processes too.
+LOADTEST_ROWS sets the synthetic OHLCV history length.
+"""
+import os
+
+from benchmarks.stubs import DEFAULT_ROWS, FakeTicker, init_stubbed_worker, install_stubs
+
+FakeTicker.rows = int(os.getenv("LOADTEST_ROWS", DEFAULT_ROWS))
+
+# Must be entered before main is imported; kept open for the life of the worker
+_stubs = install_stubs()
+
+from main import app  # noqa: E402
+from src.backtest_jobs import backtest_jobs  # noqa: E402
+
+# Backtest tickers run in spawned processes, which do not inherit the patches
+backtest_jobs.initializer = init_stubbed_worker
@@ -0,0 +1,181 @@
+"""
+Offline stand-ins for yfinance, Twitter (tweepy) and Gemini, seeded from the
+CSV and JSON files already in backend/data/.
+
+install_stubs() patches the attributes the backend modules use on the real
+library modules, so it must be entered before main.py is imported (the
+TwitterClient is constructed at import time). Spawned pool processes start
+unpatched; init_stubbed_worker() installs the stubs in them.
+"""
+import glob
+import json
+import os
+import zlib
+from contextlib import ExitStack
+from datetime import datetime
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, "data")
+DEFAULT_ROWS = 1000
+DEFAULT_STATS = {"Predicted_Next_Day": 0.0, "RMSE": 10.0, "MAE": 8.0, "Std_Dev": 10.0, "Mean_Residuals": -1.0}
+
+_worker_stubs = None  # Kept open for the life of a pool process
+
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _base_ohlcv(ticker: str) -> pd.DataFrame:
+    path = os.path.join(DATA_DIR, f"{ticker}_OHLCV.csv")
+    if not os.path.exists(path):
+        path = sorted(glob.glob(os.path.join(DATA_DIR, "*_OHLCV.csv")))[0]
+    return pd.read_csv(path)
+
+
+@lru_cache(maxsize=128)
+def _synthetic_ohlcv(ticker: str, rows: int, end: str) -> pd.DataFrame:
+    base = _base_ohlcv(ticker)
+    rng = np.random.default_rng(_seed(ticker))
+    returns = np.diff(np.log(base['Close'].values))
+    close = base['Close'].iloc[-1] * np.exp(np.cumsum(rng.choice(returns, size=rows)))
+    open_ = np.concatenate([[base['Close'].iloc[-1]], close[:-1]]) * (1 + rng.normal(0, 0.002, rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, rows)))
+    volume = rng.choice(base['Volume'].values, size=rows)
+    index = pd.bdate_range(end=pd.Timestamp(end), periods=rows, name="Date").tz_localize("Asia/Kolkata")
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+class FakeTicker:
+    """yf.Ticker look-alike; history() returns FakeTicker.rows synthetic daily bars ending at `end`."""
+    rows = DEFAULT_ROWS
+
+    def __init__(self, ticker, session=None):
+        self.ticker = ticker
+
+    def history(self, period=None, interval="1d", start=None, end=None, **kwargs):
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.today().date())
+        return _synthetic_ohlcv(self.ticker, FakeTicker.rows, end.strftime("%Y-%m-%d")).copy()
+
+    @property
+    def financials(self):
+        company_name = self.ticker.split(".")[0]
+        path = os.path.join(DATA_DIR, "Quartely_merged", f"{company_name}_Final_merged.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        quarterly = pd.read_csv(path).iloc[::-1]
+        columns = pd.to_datetime(quarterly['Date'])
+        fields = {
+            "Total Revenue": "Total Revenue", "Net Income": "Net Profit", "Operating Income": "Operating Profit",
+            "Operating Expense": "Operating Expenses", "Interest Expense": "Interest",
+            "Pretax Income": "Profit Before Tax", "Tax Provision": "Tax", "Basic EPS": "Basic EPS",
+        }
+        return pd.DataFrame(
+            [quarterly[source].values for source in fields.values()], index=list(fields), columns=columns
+        )
+
+
+def fake_download(tickers, start=None, end=None, group_by="ticker", **kwargs):
+    """yf.download look-alike returning (ticker, field) MultiIndex columns."""
+    if isinstance(tickers, str):
+        tickers = tickers.replace(",", " ").split()
+    frames = {ticker: FakeTicker(ticker).history(start=start, end=end) for ticker in tickers}
+    return pd.concat(frames, axis=1)
+
+
+def _saved_tweets(query: str):
+    company_name = query.split()[0].lstrip("#")
+    paths = sorted(glob.glob(os.path.join(DATA_DIR, "tweets_data", "*.json")))
+    matching = [p for p in paths if os.path.basename(p).startswith(company_name)]
+    with open((matching or paths)[0], "r", encoding="utf-8") as f:
+        return json.load(f).get("tweets", [])
+
+
+class FakeTweepyClient:
+    """tweepy.Client look-alike serving tweets saved under data/tweets_data/."""
+
+    def __init__(self, bearer_token=None, **kwargs):
+        self.bearer_token = bearer_token
+
+    def search_recent_tweets(self, query, max_results=10, **kwargs):
+        saved = _saved_tweets(query)[:max_results]
+        users, tweets = {}, []
+        for i, tweet in enumerate(saved):
+            name, _, handle = tweet.get("User", "Unknown (@unknown)").partition(" (@")
+            users[i] = SimpleNamespace(id=i, name=name, username=handle.rstrip(")") or "unknown")
+            tweets.append(SimpleNamespace(
+                id=tweet.get("Tweet ID", i), author_id=i, text=tweet.get("Text", ""),
+                created_at=datetime.fromisoformat(tweet["Created At"]) if tweet.get("Created At") else datetime.utcnow(),
+            ))
+        return SimpleNamespace(data=tweets, includes={"users": list(users.values())})
+
+
+class FakeGenerativeModel:
+    """genai.GenerativeModel look-alike with a deterministic sentiment per prompt."""
+
+    def __init__(self, model_name=None, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        return SimpleNamespace(text=("positive", "neutral", "negative")[_seed(prompt) % 3])
+
+
+def _stub_model_lookup(registry):
+    """Serve an untrained model of the production architecture for companies without a model file."""
+    real_get_model, real_get_stats = registry.get_model, registry.get_stats
+    fallback = {}
+
+    def get_model(company):
+        try:
+            return real_get_model(company)
+        except FileNotFoundError:
+            if "model" not in fallback:
+                from src.training_pipeline import build_model, N_SELECTED_FEATURES, TIME_STEPS
+                fallback["model"] = build_model(TIME_STEPS, N_SELECTED_FEATURES)
+            return fallback["model"], np.arange(10)
+
+    def get_stats(company):
+        try:
+            return real_get_stats(company)
+        except (FileNotFoundError, ValueError):
+            return DEFAULT_STATS
+
+    return get_model, get_stats
+
+
+def install_stubs() -> ExitStack:
+    """Patch yfinance, tweepy and Gemini; returns an ExitStack that undoes the patches on close."""
+    import google.generativeai as genai
+    import tweepy
+    import yfinance
+
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(yfinance, "Ticker", FakeTicker))
+    stack.enter_context(mock.patch.object(yfinance, "download", fake_download))
+    stack.enter_context(mock.patch.object(tweepy, "Client", FakeTweepyClient))
+    stack.enter_context(mock.patch.object(genai, "GenerativeModel", FakeGenerativeModel))
+
+    from src.model_registry import registry
+    get_model, get_stats = _stub_model_lookup(registry)
+    stack.enter_context(mock.patch.object(registry, "get_model", get_model))
+    stack.enter_context(mock.patch.object(registry, "get_stats", get_stats))
+    return stack
+
+
+def init_stubbed_worker():
+    """Pool initializer for backtest jobs under the stubbed app: init_worker plus install_stubs."""
+    global _worker_stubs
+    from src.training_pipeline import init_worker
+    init_worker()
+    FakeTicker.rows = int(os.getenv("LOADTEST_ROWS", DEFAULT_ROWS))
+    _worker_stubs = install_stubs()
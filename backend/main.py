@@ -1,12 +1,30 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+import logging
+import os
+import time
+from typing import Optional
+from fastapi import FastAPI, APIRouter, HTTPException, Request, BackgroundTasks
+from fastapi.responses import PlainTextResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.sentiment_loader import load_sentiment_data
 from src.financial_data_fetcher import fetch_financial_data
 from src.data_fetcher import fetch_stock_data
 from src.twitter_client import TwitterClient
-from src.pydanticModels import StockRequest, Ticker
-from src.backtesting_signals import signal_generate, next_day_pred
+from src.pydanticModels import StockRequest, Ticker, ForecastRequest, BulkStockRequest, BacktestJobRequest
+from src.backtesting_signals import signal_generate, next_day_pred, multi_horizon_pred
 from src.financial_graph import get_plot_data
+from src.model_registry import registry
+from src.bulk_prices import download_prices, prefetch_universe, last_prefetch
+from src.screener import screener
+from src.file_writer import writer
+from src.backtest_jobs import backtest_jobs
+from src.signal_events import broker
+from src.metrics import REQUEST_LATENCY, render_metrics
+from src.profiling import (
+    PROFILE_ID_HEADER, PROFILE_SKIPPED_HEADER, profiling_requested, profile_request, profiled, list_profiles, profile_path,
+)
+
+# Level-gated logging; set LOG_LEVEL=DEBUG to see per-stage timings and debug output
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 
 # Create FastAPI app
 app = FastAPI()
@@ -23,21 +41,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template so per-ticker paths share one series
+        route = request.scope.get("route")
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=str(status),
+        )
+
+@app.middleware("http")
+async def opt_in_profiling(request: Request, call_next):
+    # Profile only when asked via X-Profile: 1 or ?profile=1
+    if not profiling_requested(request.headers, request.query_params):
+        return await call_next(request)
+    with profile_request() as profile:
+        response = await call_next(request)
+    if profile["skipped"]:
+        response.headers[PROFILE_SKIPPED_HEADER] = profile["skipped"]
+    else:
+        response.headers[PROFILE_ID_HEADER] = profile["id"]
+    return response
+
 # Create API router
 router = APIRouter()
 
 # Initialize Twitter client
 twitter_client = TwitterClient()
 
+@app.on_event("startup")
+def load_models():
+    # Load models, selected features and residual stats once per worker
+    registry.load_all()
+    screener.refresh(force=True)
+    screener.start()
+    backtest_jobs.recover()
+
+@app.on_event("shutdown")
+def flush_writes():
+    # Finish queued OHLCV/prediction/tweet writes before the worker exits
+    writer.flush()
+    backtest_jobs.shutdown()
+
 @app.get("/")
 def root():
     return {"status": "Stock Predictor is running"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition; counters are per worker process
+    return render_metrics()
+
 @router.post("/backtestingSignals/")
+@profiled
 def backtest(ticker: Ticker):
     try:
         signals = signal_generate(ticker.ticker)
         if signals:
+            latest = signals[-1]
+            screener.update(ticker.ticker, technical_signal=latest[ticker.ticker], technical_date=latest['Date'])
+            broker.publish(ticker.ticker, "technical_signal", {"latest": latest, "count": len(signals)})
             return signals
         else:
             raise HTTPException(status_code=500, detail="No signals generated")
@@ -45,14 +117,83 @@ def backtest(ticker: Ticker):
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
     
 
+@router.post("/backtest-jobs/")
+def submit_backtest_job(request: BacktestJobRequest):
+    # Backtest many tickers in the background; poll GET /backtest-jobs/{job_id}
+    try:
+        return backtest_jobs.submit(request.tickers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@router.get("/backtest-jobs/{job_id}")
+def backtest_job_status(job_id: str):
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job '{job_id}' not found")
+    return job
+
+
+@router.get("/backtest-jobs/{job_id}/results")
+def backtest_job_results(job_id: str):
+    try:
+        results = backtest_jobs.results(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"No results for backtest job '{job_id}' yet")
+    return results
+
+
 @router.post("/next_day_pred")
+@profiled
 def next_day(ticker: Ticker):
     try:
         predictions = next_day_pred(ticker.ticker)
+        screener.update(
+            ticker.ticker,
+            next_day_signal=predictions["signal"],
+            predicted_price=predictions["predicted_price"],
+            last_close=predictions["previous_day_price"]
+        )
+        broker.publish(ticker.ticker, "next_day_prediction", predictions)
         return predictions
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
+@router.post("/multi_day_pred")
+@profiled
+def multi_day(request: ForecastRequest):
+    try:
+        predictions = multi_horizon_pred(request.ticker, request.horizon)
+        broker.publish(request.ticker, "multi_day_prediction", predictions)
+        return predictions
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+@router.get("/model-metadata/")
+def model_metadata():
+    try:
+        return registry.metadata()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@router.get("/model-metadata/{ticker}")
+def model_metadata_for_ticker(ticker: str):
+    try:
+        company_name = ticker.split(".")[0]
+        metadata = registry.metadata(company_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    if not metadata:
+        raise HTTPException(status_code=404, detail=f"No model metadata for ticker '{ticker}'")
+    return metadata[company_name]
+
 # @router.get("/get-sentiment/{ticker}/")
 # def get_sentiment(ticker: str):
 #     try:
@@ -74,6 +215,7 @@ def next_day(ticker: Ticker):
 
 
 @router.get("/get-financial-data/{ticker}")
+@profiled
 def get_financial_data(ticker: str):
     try:
         financial_data = fetch_financial_data(ticker)
@@ -89,6 +231,7 @@ def get_financial_data(ticker: str):
 
 
 @router.post("/fetch-data")
+@profiled
 def get_stock_data(request: StockRequest):
     try:
         stock_data = fetch_stock_data(request.ticker, request.period, request.interval)
@@ -105,10 +248,70 @@ def get_stock_data(request: StockRequest):
 
 
 
+@router.post("/fetch-data/bulk")
+@profiled
+def get_bulk_stock_data(request: BulkStockRequest):
+    try:
+        prices, failures = download_prices(request.tickers, save=False, period=request.period, interval=request.interval)
+        return {
+            "status": "success" if not failures else "partial",
+            "data": {ticker: frame.to_dict(orient="records") for ticker, frame in prices.items()},
+            "failed": failures
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@router.post("/prefetch")
+def prefetch(background_tasks: BackgroundTasks):
+    # Refresh data/{ticker}_OHLCV.csv for the whole universe in one batched download
+    background_tasks.add_task(prefetch_universe)
+    return {"status": "scheduled"}
+
+
+@router.get("/prefetch")
+def prefetch_status():
+    return last_prefetch or {"status": "not run"}
+
+
+@router.get("/screener/")
+def screen(technical: Optional[str] = None, financial: Optional[str] = None, sentiment: Optional[str] = None,
+           min_sentiment: Optional[float] = None, sort_by: str = "ticker", descending: bool = False,
+           limit: Optional[int] = None):
+    """
+    Filter and rank the universe from stored signals, e.g.
+    /screener/?technical=buy&sentiment=positive&sort_by=upside_pct&descending=true
+    """
+    try:
+        results = screener.screen(technical, financial, sentiment, min_sentiment, sort_by, descending, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    return {"count": len(results), "results": results}
+
+
+@router.get("/stream/signals")
+async def stream_signals(request: Request, tickers: Optional[str] = None):
+    """
+    Server-sent events for freshly computed predictions, signals and sentiment, e.g.
+    /stream/signals?tickers=RELIANCE.NS,TCS.NS (omit tickers to receive every ticker)
+    """
+    subscription = broker.subscribe([t.strip() for t in tickers.split(",") if t.strip()] if tickers else None)
+    return StreamingResponse(
+        broker.stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/sentiment-and-tweets/{ticker}/")
+@profiled
 def get_sentiment_and_tweets(ticker: str):
     try:
         result = twitter_client.get_sentiment_and_tweets(ticker, max_results=10)
+        screener.update(ticker, sentiment_score=result.get("sentiment_score"), sentiment_signal=result.get("signal"))
+        broker.publish(ticker, "sentiment", {"sentiment_score": result.get("sentiment_score"), "signal": result.get("signal")})
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch sentiment and tweets: {str(e)}")
@@ -116,6 +319,7 @@ def get_sentiment_and_tweets(ticker: str):
 
 
 @router.post("/get-plot-data/")
+@profiled
 def get_plot_data_endpoint(ticker: Ticker):
     """
     Fetch data for plotting daily closing prices and quarterly predicted price ranges.
@@ -132,5 +336,19 @@ def get_plot_data_endpoint(ticker: Ticker):
         raise HTTPException(status_code=500, detail=f"Failed to fetch plot data: {str(e)}")
 
 
+@router.get("/profiles/")
+def get_profiles():
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, kind: str = "stats"):
+    # kind: "stats" (text summary), "prof" (raw cProfile dump) or "tf" (zipped TensorFlow trace)
+    path = profile_path(profile_id, kind)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' ({kind}) not found")
+    return FileResponse(path, filename=os.path.basename(path))
+
+
 # Include router
 app.include_router(router)
\ No newline at end of file
@@ -0,0 +1,233 @@
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.backtesting_signals import backtest_window, get_stocks_data, technical_predictions
+from src.bulk_prices import download_prices
+from src.file_writer import atomic_write
+from src.metrics import span
+from src.screener import screener
+from src.signal_events import broker
+from src.training_pipeline import init_worker
+
+logger = logging.getLogger(__name__)
+
+BACKTESTS_FOLDER = os.path.join("outputs", "backtests")
+MAX_WORKERS = int(os.getenv("BACKTEST_WORKERS", "2"))  # Each worker process loads its own TF models
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but owned by someone else
+    return True
+
+
+def _backtest_ticker(ticker: str, ohlcv: Optional[pd.DataFrame], start_date, end_date) -> List[Dict]:
+    # Runs in a pool process, so it must stay a module-level function
+    if ohlcv is None:
+        ohlcv = get_stocks_data(ticker, start_date, end_date)
+    return technical_predictions(ticker, ohlcv, save=False)
+
+
+class BacktestJobs:
+    """
+    Multi-ticker backtests run in the background.
+
+    A job first downloads prices for all its tickers in one batched call
+    (falling back to a per-ticker fetch for any the batch missed), then
+    runs technical_predictions for each ticker on a shared process pool
+    (spawned like training_pipeline's, since indicator building and Keras
+    inference are CPU-bound and the models are not safe to share across
+    threads). Progress is kept in memory and mirrored to
+    outputs/backtests/{job_id}.json so any worker process can answer a
+    poll. Signals for the whole job are written to one gzipped long-format
+    CSV (Date, Ticker, Signal), outputs/backtests/{job_id}.csv.gz.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, initializer: Callable[[], None] = init_worker):
+        self.max_workers = max_workers
+        self.initializer = initializer  # Runs in every pool process; must be a module-level function
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Started on the first job so importing the app does not spawn processes
+        with self._lock:
+            if self._executor is None:
+                ctx = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx,
+                                                     initializer=self.initializer)
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def recover(self):
+        """
+        Mark jobs left queued or running by a worker process that no longer
+        exists as failed, so their pollers don't wait forever.
+        """
+        for status_path in glob.glob(os.path.join(BACKTESTS_FOLDER, "*.json")):
+            try:
+                with open(status_path) as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable backtest status {status_path}: {e}")
+                continue
+            if job.get("status") not in ("queued", "running") or _pid_alive(job.get("worker_pid")):
+                continue
+            job["status"] = "failed"
+            job["error"] = "Interrupted by a worker restart"
+            job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+            self._save_status(job)
+            logger.warning(f"Backtest job {job['job_id']} was interrupted; marked as failed")
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(BACKTESTS_FOLDER, f"{job_id}.json")
+
+    def results_path(self, job_id: str) -> str:
+        return os.path.join(BACKTESTS_FOLDER, f"{job_id}.csv.gz")
+
+    def _save_status(self, job: Dict):
+        with self._lock:
+            snapshot = json.dumps(job)
+
+        def write(tmp_path):
+            with open(tmp_path, "w") as f:
+                f.write(snapshot)
+
+        atomic_write(self._status_path(job["job_id"]), write)
+
+    def submit(self, tickers: List[str]) -> Dict:
+        tickers = list(dict.fromkeys(t.strip() for t in tickers if t.strip()))
+        if not tickers:
+            raise ValueError("No tickers given")
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "tickers": tickers,
+            "total": len(tickers),
+            "completed": 0,
+            "succeeded": [],
+            "failed": {},
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "worker_pid": os.getpid(),
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._save_status(job)
+        # The coordinator only waits on the pool, so it gets its own thread
+        threading.Thread(target=self._run, args=(job,), name=f"backtest-{job_id[:8]}", daemon=True).start()
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return json.loads(json.dumps(job))
+        # Submitted through another worker process
+        status_path = self._status_path(job_id)
+        if not os.path.exists(status_path):
+            return None
+        with open(status_path) as f:
+            return json.load(f)
+
+    def results(self, job_id: str) -> Optional[Dict[str, List[Dict]]]:
+        """{ticker: [{"Date", "Signal"}, ...]} for a finished job."""
+        if not JOB_ID_PATTERN.match(job_id) or not os.path.exists(self.results_path(job_id)):
+            return None
+        df = pd.read_csv(self.results_path(job_id))
+        return {
+            ticker: group[["Date", "Signal"]].to_dict(orient="records")
+            for ticker, group in df.groupby("Ticker", sort=False)
+        }
+
+    def _run(self, job: Dict):
+        job_id = job["job_id"]
+        with self._lock:
+            job["status"] = "running"
+        self._save_status(job)
+        try:
+            start_date, end_date = backtest_window()
+
+            # Shared data pass: one batched download for every ticker in the job
+            with span("backtest_jobs", "data_fetch"):
+                prices, failures = download_prices(
+                    job["tickers"], start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d')
+                )
+            if failures:
+                logger.info(f"Backtest job {job_id}: fetching {len(failures)} tickers individually")
+
+            frames = []
+            pool = self._pool()
+            futures = {
+                pool.submit(_backtest_ticker, ticker, prices.get(ticker), start_date, end_date): ticker
+                for ticker in job["tickers"]
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    signals = future.result()
+                    if signals:
+                        frames.append(pd.DataFrame({
+                            "Date": [s["Date"] for s in signals],
+                            "Ticker": ticker,
+                            "Signal": [s[ticker] for s in signals],
+                        }))
+                        latest = signals[-1]
+                        screener.update(ticker, technical_signal=latest[ticker], technical_date=latest["Date"])
+                        broker.publish(ticker, "technical_signal", {"latest": latest, "count": len(signals)})
+                    with self._lock:
+                        job["succeeded"].append(ticker)
+                except Exception as e:
+                    logger.error(f"Backtest job {job_id} failed for {ticker}: {e}")
+                    with self._lock:
+                        job["failed"][ticker] = str(e)
+                with self._lock:
+                    job["completed"] += 1
+                self._save_status(job)
+
+            with span("backtest_jobs", "persist"):
+                results = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Date", "Ticker", "Signal"])
+                atomic_write(
+                    self.results_path(job_id),
+                    lambda tmp_path: results.to_csv(tmp_path, index=False, compression="gzip")
+                )
+            with self._lock:
+                job["status"] = "finished" if job["succeeded"] else "failed"
+        except Exception as e:
+            logger.error(f"Backtest job {job_id} failed: {e}")
+            with self._lock:
+                job["status"] = "failed"
+                job["error"] = str(e)
+        with self._lock:
+            job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        self._save_status(job)
+
+
+backtest_jobs = BacktestJobs()
@@ -1,14 +1,18 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import tensorflow as tf
 from sklearn.preprocessing import MinMaxScaler
-import ta
 from datetime import datetime, timedelta
-from tensorflow.keras.models import Model
-from tensorflow.keras.layers import Input, Dense, LSTM, Bidirectional, Dot, Activation
 import os
-import io
+import logging
+from src.model_registry import registry
+from src.metrics import span
+from src.profiling import tf_trace
+from src.market_data import market_data
+from src.file_writer import writer
+from src.unified_frame import build_unified_frame, get_quarter_table
+from src.feature_store import add_technical_indicators, build_indicator_frame, get_indicator_frame
+
+logger = logging.getLogger(__name__)
 
 
 def format_float(value):
@@ -19,6 +23,23 @@ def format_float(value):
     return round(float(value), 3)
 
 
+def store_ohlcv_data(ticker, df):
+    """Keep the OHLCV columns of a yfinance frame and save them to data/{ticker}_OHLCV.csv."""
+    # Select only OHLC columns and reset index to include Date as a column
+    ohlc_data = df[['Open', 'High', 'Low', 'Close', 'Volume']].reset_index()
+
+    # Rename 'Date' column to ensure consistency
+    ohlc_data.rename(columns={'Date': 'Date'}, inplace=True)
+
+    # Save to CSV atomically on the background writer; callers mutate the returned frame, so write a copy
+    output_path = f"data/{ticker}_OHLCV.csv"
+    snapshot = ohlc_data.copy()
+    writer.submit(output_path, lambda tmp_path: snapshot.to_csv(tmp_path, index=False))
+
+    logger.debug(f"OHLC data for {ticker} queued for {output_path} ({len(ohlc_data)} rows)")
+    return ohlc_data
+
+
 def get_stocks_data(ticker, start_date, end_date):
     try:
         ticker_symbol = ticker
@@ -26,93 +47,40 @@ def get_stocks_data(ticker, start_date, end_date):
         start_date_str = start_date.strftime('%Y-%m-%d')
         end_date_str = end_date.strftime('%Y-%m-%d')
 
-        print("Start Date:", start_date_str)
-        print("End Date:", end_date_str)
-
-        # Fetch the data using yfinance
-        ticker_obj = yf.Ticker(ticker_symbol)
-        df = ticker_obj.history(start=start_date_str, end=end_date_str)
+        logger.debug(f"Fetching {ticker_symbol} from {start_date_str} to {end_date_str}")
 
-        # Select only OHLC columns and reset index to include Date as a column
-        ohlc_data = df[['Open', 'High', 'Low', 'Close', 'Volume']].reset_index()
+        # Fetch the data using the shared yfinance client
+        with span("get_stocks_data", "data_fetch"):
+            df = market_data.history(ticker_symbol, start=start_date_str, end=end_date_str)
 
-        # Rename 'Date' column to ensure consistency
-        ohlc_data.rename(columns={'Date': 'Date'}, inplace=True)
-
-        # Save to CSV
-        output_path = f"data/{ticker}_OHLCV.csv"  # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        ohlc_data.to_csv(output_path, index=False)
-        print("end",ohlc_data.tail(2));
-        print("start",ohlc_data.head(2));
-        
-        print(f"OHLC data for {ticker_symbol} saved to {output_path}")
-        return ohlc_data
+        return store_ohlcv_data(ticker_symbol, df)
     
     except Exception as e:
-        print(f"Error in get_stocks_data: {e}")
+        logger.error(f"Error in get_stocks_data: {e}")
         raise e
 
 
-def get_quarter(date):
-    """Convert a date to its corresponding quarter (e.g., '2023Q1')."""
-    year = date.year
-    quarter = (date.month - 1) // 3 + 1
-    return f"{year}Q{quarter}"
-
-
-def load_financial_signals(ticker):
-    """Load financial signals from CSV for the given ticker."""
-    try:
-        company_name = ticker.split(".")[0]
-        signals_file = os.path.join("financial_signals", f"{company_name}_predictions_signals.csv")
-        if not os.path.exists(signals_file):
-            print(f"Financial signals file not found: {signals_file}")
-            return None
-        signals_df = pd.read_csv(signals_file)
-        # Create a dictionary mapping quarters to signals
-        signals_dict = dict(zip(signals_df['Quarter'], signals_df['Signal']))
-        return signals_dict
-    except Exception as e:
-        print(f"Error loading financial signals: {e}")
-        return None
-
-
-def technical_predictions(ticker, OHLCV_DATA):
+def technical_predictions(ticker, OHLCV_DATA, save=True):
     try:
         # Paths and inputs
         output_folder = "outputs"
-        models_folder = "models"
         company_name = ticker.split(".")[0]
 
-        # Load financial signals
-        financial_signals = load_financial_signals(ticker)
-
-        # Attention layer (needed to load the model)
-        def attention_layer(lstm_output):
-            attention = Dense(1, activation='tanh')(lstm_output)
-            attention = Activation('sigmoid')(attention)
-            context = Dot(axes=1)([attention, lstm_output])
-            return context
+        # Quarterly financial signals from the local files (no price fetch)
+        with span("technical_predictions", "signals_load"):
+            quarters = get_quarter_table(ticker)
 
         # Load data
         df = OHLCV_DATA
         df.set_index('Date', inplace=True)
-        print(df.tail())
-
-        # Add Adj Close (approximate as Close if not available)
-        df['Adj Close'] = df['Close']  # Assuming no adjustments; replace with actual data if available
-
-        # Add technical indicators (consistent with training)
-        df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
-        stochastic = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
-        df['Stochastic_K'] = stochastic.stoch()
-        df['Stochastic_D'] = stochastic.stoch_signal()
-        df['Williams_%R'] = ta.momentum.WilliamsRIndicator(df['High'], df['Low'], df['Close'], lbp=14).williams_r()
-        df['MFI'] = ta.volume.MFIIndicator(df['High'], df['Low'], df['Close'], df['Volume'], window=14).money_flow_index()
-        df['AD_Line'] = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], df['Volume']).acc_dist_index()
-        df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
-        df.dropna(inplace=True)
+
+        with span("technical_predictions", "indicators"):
+            # Add Adj Close (approximate as Close if not available)
+            df['Adj Close'] = df['Close']  # Assuming no adjustments; replace with actual data if available
+
+            # Add technical indicators (consistent with training)
+            add_technical_indicators(df)
+            df.dropna(inplace=True)
 
         # Prepare X and y
         X = df.drop(columns=['Close']).values  # Shape: (n_rows, 12) with Adj Close
@@ -124,16 +92,11 @@ def technical_predictions(ticker, OHLCV_DATA):
         scaler_y = MinMaxScaler()
         y_scaled = scaler_y.fit_transform(y.reshape(-1, 1))
 
-        # Load selected features
-        selected_features_path = os.path.join(models_folder, f"{company_name}_features.npy")
-        if not os.path.exists(selected_features_path):
-            raise FileNotFoundError(f"Selected features file not found: {selected_features_path}")
-        selected_features = np.load(selected_features_path)
+        # Load model and selected features from the registry
+        with span("technical_predictions", "model_load"):
+            model, selected_features = registry.get_model(company_name)
 
-        # Debugging
-        print("X_scaled shape:", X_scaled.shape)
-        print("Selected features:", selected_features)
-        print("Max index in selected_features:", selected_features.max())
+        logger.debug(f"X_scaled shape: {X_scaled.shape}, selected features: {selected_features}")
 
         # Ensure all indices are valid
         n_features = X_scaled.shape[1]
@@ -149,30 +112,16 @@ def technical_predictions(ticker, OHLCV_DATA):
             X_seq.append(X_selected[i:i + time_steps])
         X_seq = np.array(X_seq)  # Shape: (n_rows - 10, 10, 10)
 
-        # Load model
-        model_path = os.path.join(models_folder, f"{company_name}.h5")
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model file not found: {model_path}")
-        model = tf.keras.models.load_model(
-            model_path,
-            custom_objects={'attention_layer': attention_layer, 'mse': tf.keras.losses.MeanSquaredError()}
-        )
-
         # Predict
-        y_pred_scaled = model.predict(X_seq)  # Shape: (samples, timesteps, 1)
+        with span("technical_predictions", "inference"), tf_trace():
+            y_pred_scaled = model.predict(X_seq, verbose=0)  # Shape: (samples, timesteps, 1)
         y_pred_scaled = y_pred_scaled[:, -1, :]  # Take last timestep: (samples, 1)
         y_pred = scaler_y.inverse_transform(y_pred_scaled).flatten()
 
-        # Load standard deviation and mean residuals
-        predicted_df_path = os.path.join(models_folder, "predicted.csv")
-        if not os.path.exists(predicted_df_path):
-            raise FileNotFoundError(f"Predicted CSV file not found: {predicted_df_path}")
-        predicted_df = pd.read_csv(predicted_df_path)
-        company_stats = predicted_df[predicted_df['Company'] == company_name]
-        if company_stats.empty:
-            raise ValueError(f"No stats found for company: {company_name}")
-        std_dev = company_stats['Std_Dev'].values[0]
-        mean_residuals = company_stats['Mean_Residuals'].values[0]
+        # Standard deviation and mean residuals from the registry
+        company_stats = registry.get_stats(company_name)
+        std_dev = company_stats['Std_Dev']
+        mean_residuals = company_stats['Mean_Residuals']
 
         # Adjust predictions based on mean residuals
         if mean_residuals > 0:
@@ -182,214 +131,216 @@ def technical_predictions(ticker, OHLCV_DATA):
             adjusted_pred = y_pred - std_dev
             adjustment_direction = "subtracted"
 
-        print(f"Mean Residuals: {mean_residuals:.4f}, Std_Dev: {std_dev:.4f}, Adjustment: {adjustment_direction}")
-
-        # Generate results
-        results = []
-        backtest_results = []
-        for i in range(time_steps, len(df)):
-            date = df.index[i]
-            actual_close = y[i - time_steps]
-            pred_idx = i - time_steps
-            predicted_close = y_pred[pred_idx]
-            adjusted_predicted_close = adjusted_pred[pred_idx]
-            prev_actual_close = y[i - time_steps - 1] if i > time_steps else np.nan
-
-            if np.isnan(prev_actual_close):
-                technical_signal = None  # Replace NaN with None for JSON compatibility
-            else:
-                diff = abs(adjusted_predicted_close - prev_actual_close)
-                if diff <= 0.05 * prev_actual_close:
-                    technical_signal = 0  # Hold
-                elif adjusted_predicted_close > prev_actual_close:
-                    technical_signal = 1  # Buy
-                else:
-                    technical_signal = -1  # Sell
-
-            # Get financial signal for the date's quarter
-            financial_signal = None
-            if financial_signals:
-                quarter = get_quarter(date)
-                financial_signal = financial_signals.get(quarter)
-
-            # Calculate final signal (80% technical, 20% financial)
-            final_signal = technical_signal
-            if financial_signal is not None and technical_signal is not None:
-                # Ensure signals are numeric for weighting
-                weighted_signal = (0.8 * technical_signal) + (0.2 * financial_signal)
-                # Round to nearest signal value (-1, 0, 1)
-                if weighted_signal > 0.5:
-                    final_signal = 1
-                elif weighted_signal < -0.5:
-                    final_signal = -1
+        logger.debug(f"Mean Residuals: {mean_residuals:.4f}, Std_Dev: {std_dev:.4f}, Adjustment: {adjustment_direction}")
+
+        # Financial signal of each row's quarter (NaN where none), joined onto the prices we were given
+        financial_signals = build_unified_frame(ticker, df[[]], quarters)['Financial_Signal'].values.astype(float)
+
+        with span("technical_predictions", "serialization"):
+            # Generate results
+            results = []
+            backtest_results = []
+            for i in range(time_steps, len(df)):
+                date = df.index[i]
+                actual_close = y[i - time_steps]
+                pred_idx = i - time_steps
+                predicted_close = y_pred[pred_idx]
+                adjusted_predicted_close = adjusted_pred[pred_idx]
+                prev_actual_close = y[i - time_steps - 1] if i > time_steps else np.nan
+
+                if np.isnan(prev_actual_close):
+                    technical_signal = None  # Replace NaN with None for JSON compatibility
                 else:
-                    final_signal = 0
-
-            # Convert date to timezone-naive string
-            date_str = date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(date, pd.Timestamp) else str(date)
-
-            results.append({
-                'Date': date_str,
-                'Actual_Close': format_float(actual_close),
-                'Predicted_Close': format_float(predicted_close),
-                'prev_actual_close': format_float(prev_actual_close),
-                'Adjusted_Predicted_Close': format_float(adjusted_predicted_close),
-                'Technical_Signal': technical_signal,
-                'Financial_Signal': financial_signal,
-                'Final_Signal': final_signal
-            })
-
-            if (final_signal):
-                backtest_results.append({
-                    'Date': date_str.split(" ")[0],f"{ticker}": final_signal
+                    diff = abs(adjusted_predicted_close - prev_actual_close)
+                    if diff <= 0.05 * prev_actual_close:
+                        technical_signal = 0  # Hold
+                    elif adjusted_predicted_close > prev_actual_close:
+                        technical_signal = 1  # Buy
+                    else:
+                        technical_signal = -1  # Sell
+
+                # Get financial signal for the date's quarter
+                financial_signal = None
+                if not np.isnan(financial_signals[i]):
+                    financial_signal = int(financial_signals[i])
+
+                # Calculate final signal (80% technical, 20% financial)
+                final_signal = technical_signal
+                if financial_signal is not None and technical_signal is not None:
+                    # Ensure signals are numeric for weighting
+                    weighted_signal = (0.8 * technical_signal) + (0.2 * financial_signal)
+                    # Round to nearest signal value (-1, 0, 1)
+                    if weighted_signal > 0.5:
+                        final_signal = 1
+                    elif weighted_signal < -0.5:
+                        final_signal = -1
+                    else:
+                        final_signal = 0
+
+                # Convert date to timezone-naive string
+                date_str = date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(date, pd.Timestamp) else str(date)
+
+                results.append({
+                    'Date': date_str,
+                    'Actual_Close': format_float(actual_close),
+                    'Predicted_Close': format_float(predicted_close),
+                    'prev_actual_close': format_float(prev_actual_close),
+                    'Adjusted_Predicted_Close': format_float(adjusted_predicted_close),
+                    'Technical_Signal': technical_signal,
+                    'Financial_Signal': financial_signal,
+                    'Final_Signal': final_signal
                 })
 
-        # Save results
-        os.makedirs(output_folder, exist_ok=True)
-        results_df = pd.DataFrame(backtest_results)
-        output_file = os.path.join(output_folder, f"technical_{ticker}_predictions.csv")
-        results_df.to_csv(output_file, index=False, na_rep='')  # Use empty string for None/NaN in CSV
+                if (final_signal):
+                    backtest_results.append({
+                        'Date': date_str.split(" ")[0],f"{ticker}": final_signal
+                    })
 
-        print(f"Predictions saved to {output_file}")
+        # Save results (batch backtests persist their own combined file instead)
+        if save:
+            output_file = os.path.join(output_folder, f"technical_{ticker}_predictions.csv")
+            results_df = pd.DataFrame(backtest_results)
+            # Use empty string for None/NaN in CSV; written atomically off the request path
+            writer.submit(output_file, lambda tmp_path: results_df.to_csv(tmp_path, index=False, na_rep=''))
+
+            logger.debug(f"Predictions queued for {output_file}")
         return backtest_results  # Return as list of dicts for JSON compatibility
 
     except Exception as e:
-        print(f"Error in technical_predictions: {e}")
+        logger.error(f"Error in technical_predictions: {e}")
         raise e
     
 
+def backtest_window():
+    """(start, end) of the backtest period: 2021-07-07 to the end of the previous quarter."""
+    start_date = datetime(2021, 7, 7)
+    # Define today's date
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Calculate the previous quarter's end date
+    def get_previous_quarter_end(date):
+        month = (date.month - 1) // 3 * 3
+        if month == 0:
+            return datetime(date.year - 1, 12, 31)
+        else:
+            return datetime(date.year, month, 1) - timedelta(days=1)
+
+    return start_date, get_previous_quarter_end(today)
+
+
 def signal_generate(ticker):
     try:
         # Fetch stock data
-        start_date = datetime(2021, 7, 7)
-        # Define today's date
-        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
-        # Calculate the previous quarter's end date
-        def get_previous_quarter_end(date):
-            month = (date.month - 1) // 3 * 3
-            if month == 0:
-                return datetime(date.year - 1, 12, 31)
-            else:
-                return datetime(date.year, month, 1) - timedelta(days=1)
-
-        end_date = get_previous_quarter_end(today)
+        start_date, end_date = backtest_window()
 
         input_data = get_stocks_data(ticker, start_date, end_date)
         # Generate signals using technical predictions
         signals = technical_predictions(ticker, input_data)
         return signals
     except Exception as e:
-        print(f"Error in signal_generate: {e}")
+        logger.error(f"Error in signal_generate: {e}")
         raise e
 
 
-def next_day_pred(ticker):
-    try:
-        # Paths and inputs
-        output_folder = "outputs"  # Path to model, features, and metrics
-        models_folder = "models"
-
-        company_name = ticker.split(".")[0]  # Replace with your company name
-        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
-        # Set end_date as the previous day's date
-        # end_date = today + timedelta(days=1)
-        end_date = today 
-
-        # Set start_date as 100 days before end_date
-        start_date = end_date - timedelta(days=100)
-        
-        ohlcv_data = get_stocks_data(ticker, start_date, end_date)  # Path to input OHLCV CSV
-
-        # Attention layer (needed to load the model)
-        def attention_layer(lstm_output):
-            attention = Dense(1, activation='tanh')(lstm_output)
-            attention = Activation('sigmoid')(attention)
-            context = Dot(axes=1)([attention, lstm_output])
-            return context
-
-        # Load data
-        df = ohlcv_data
-        df.set_index('Date', inplace=True)
-
-        # Add technical indicators (consistent with training)
-        df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
-        stochastic = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
-        df['Stochastic_K'] = stochastic.stoch()
-        df['Stochastic_D'] = stochastic.stoch_signal()
-        df['Williams_%R'] = ta.momentum.WilliamsRIndicator(df['High'], df['Low'], df['Close'], lbp=14).williams_r()
-        df['MFI'] = ta.volume.MFIIndicator(df['High'], df['Low'], df['Close'], df['Volume'], window=14).money_flow_index()
-        df['AD_Line'] = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], df['Volume']).acc_dist_index()
-        df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
-
-        # Add Adj Close to match training data structure
-        df['Adj Close'] = df['Close']  # Approximate; replace with actual data if available
-        df.dropna(inplace=True)
-
-        # Prepare X
-        X = df.drop(columns=['Close']).values  # Shape: (n_rows, 12) with Adj Close
-
-        # Scale features
-        scaler_X = MinMaxScaler()
-        X_scaled = scaler_X.fit_transform(X)  # Note: Ideally, load training scaler
-
-        # Load selected features
-        selected_features = np.load(os.path.join(models_folder, f"{company_name}_features.npy"))
-
-        # Validate features
-        n_features = X_scaled.shape[1]
-        if selected_features.max() >= n_features:
-            raise ValueError(f"Feature indices ({selected_features.max()}) exceed available columns ({n_features}).")
+NEXT_DAY_TIME_STEPS = 10
+NEXT_DAY_HOLD_THRESHOLD = 0.034
+MAX_HORIZON = 30
+
+
+def _load_next_day_state(ticker):
+    """Fetch the last 100 days and build the indicator frame, scalers, model and stats used by next_day_pred."""
+    company_name = ticker.split(".")[0]
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Set end_date as the previous day's date
+    # end_date = today + timedelta(days=1)
+    end_date = today
+
+    # Set start_date as 100 days before end_date
+    start_date = end_date - timedelta(days=100)
+
+    ohlcv_data = get_stocks_data(ticker, start_date, end_date)
+    ohlcv_data.set_index('Date', inplace=True)
+
+    # Technical indicators with Adj Close appended after them (consistent with training)
+    with span("next_day_pred", "indicators"):
+        df = get_indicator_frame(ticker, ohlcv_data, adj_close_first=False)
+
+    # Scale features
+    scaler_X = MinMaxScaler()
+    scaler_X.fit(df.drop(columns=['Close']).values)  # Note: Ideally, load training scaler
+    scaler_y = MinMaxScaler()
+    scaler_y.fit(df['Close'].values.reshape(-1, 1))  # Fit scaler for inverse transform
+
+    # Load model and selected features from the registry
+    with span("next_day_pred", "model_load"):
+        model, selected_features = registry.get_model(company_name)
+
+    # Validate features
+    n_features = len(df.columns) - 1
+    if selected_features.max() >= n_features:
+        raise ValueError(f"Feature indices ({selected_features.max()}) exceed available columns ({n_features}).")
+
+    return {
+        "company_name": company_name,
+        "ohlcv": ohlcv_data,
+        "features": df,
+        "scaler_X": scaler_X,
+        "scaler_y": scaler_y,
+        "model": model,
+        "selected_features": selected_features,
+        "stats": registry.get_stats(company_name),
+    }
+
+
+def _predict_from_features(state, features):
+    """Predict the close following the last NEXT_DAY_TIME_STEPS rows of an indicator frame."""
+    time_steps = NEXT_DAY_TIME_STEPS
+    X_scaled = state["scaler_X"].transform(features.drop(columns=['Close']).values)
+    X_selected = X_scaled[:, state["selected_features"]]  # Shape: (n_rows, 10)
+    if len(X_selected) < time_steps:
+        raise ValueError(f"Input data has {len(X_selected)} rows, but at least {time_steps} are required.")
+
+    # Take the last time_steps rows for prediction
+    X_seq = X_selected[-time_steps:].reshape(1, time_steps, X_selected.shape[1])  # Shape: (1, 10, 10)
+    with span("next_day_pred", "inference"), tf_trace():
+        y_pred_scaled = state["model"].predict(X_seq, verbose=0)  # Shape: (1, timesteps, 1)
+    y_pred_scaled = y_pred_scaled[0, -1, :]  # Take last timestep: (1,)
+    return state["scaler_y"].inverse_transform(y_pred_scaled.reshape(1, -1))[0, 0]  # Scalar value
+
+
+def _adjust_prediction(y_pred, stats):
+    """Shift a raw prediction by Std_Dev in the direction of the mean residual."""
+    if stats['Mean_Residuals'] > 0:
+        return y_pred + stats['Std_Dev'], "added"
+    return y_pred - stats['Std_Dev'], "subtracted"
+
+
+def _trading_signal(adjusted_pred, last_close):
+    diff = abs(adjusted_pred - last_close)
+    if diff <= NEXT_DAY_HOLD_THRESHOLD * last_close:
+        return 0  # HOLD
+    elif adjusted_pred > last_close:
+        return 1  # BUy
+    return -1  # Sell
 
-        X_selected = X_scaled[:, selected_features]  # Shape: (n_rows, 10)
-
-        # Create sequence for the last time_steps days
-        time_steps = 10
-        if len(X_selected) < time_steps:
-            raise ValueError(f"Input data has {len(X_selected)} rows, but at least {time_steps} are required.")
 
-        # Take the last time_steps rows for prediction
-        X_seq = X_selected[-time_steps:].reshape(1, time_steps, X_selected.shape[1])  # Shape: (1, 10, 10)
-
-        # Load model
-        model_path = os.path.join(models_folder, f"{company_name}.h5")
-        model = tf.keras.models.load_model(
-            model_path,
-            custom_objects={'attention_layer': attention_layer, 'mse': tf.keras.losses.MeanSquaredError()}
-        )
+def next_day_pred(ticker):
+    try:
+        state = _load_next_day_state(ticker)
+        df = state["features"]
 
         # Predict next day's close
-        y_pred_scaled = model.predict(X_seq)  # Shape: (1, timesteps, 1)
-        y_pred_scaled = y_pred_scaled[0, -1, :]  # Take last timestep: (1,)
-        scaler_y = MinMaxScaler()
-        scaler_y.fit(df['Close'].values.reshape(-1, 1))  # Fit scaler for inverse transform
-        y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(1, -1))[0, 0]  # Scalar value
+        y_pred = _predict_from_features(state, df)
 
-        # Load standard deviation and mean residuals
-        predicted_df = pd.read_csv(os.path.join(models_folder, "predicted.csv"))
-        std_dev = predicted_df[predicted_df['Company'] == company_name]['Std_Dev'].values[0]
-        mean_residuals = predicted_df[predicted_df['Company'] == company_name]['Mean_Residuals'].values[0]
-
-        # Adjust prediction
-        if mean_residuals > 0:
-            adjusted_pred = y_pred + std_dev
-            adjustment_direction = "added"
-        else:
-            adjusted_pred = y_pred - std_dev
-            adjustment_direction = "subtracted"
+        # Adjust prediction using the registry's standard deviation and mean residuals
+        adjusted_pred, adjustment_direction = _adjust_prediction(y_pred, state["stats"])
 
         # Generate trading signal
         last_close = df['Close'].iloc[-1]
-        diff = abs(adjusted_pred - last_close)
-        if diff <= 0.034 * last_close:
-            signal = 0  # HOLD
-        elif adjusted_pred > last_close:
-            signal = 1  # BUy
-        else:
-            signal = -1  # Sell
+        signal = _trading_signal(adjusted_pred, last_close)
 
         # Output results
         result = {
-            'Company': company_name,
+            'Company': state["company_name"],
             'Date': df.index[-1],  # Last date in input
             'Next_Day_Predicted_Close': float(y_pred),
             'Next_Day_Adjusted_Predicted_Close': float(adjusted_pred),
@@ -397,7 +348,7 @@ def next_day_pred(ticker):
             'Adjustment': adjustment_direction
         }
 
-        print("Prediction Result:",result)
+        logger.debug(f"Prediction Result: {result}")
         
         apiResult={
             "predicted_price":float(adjusted_pred),
@@ -409,5 +360,63 @@ def next_day_pred(ticker):
 
         return apiResult
     except Exception as e:
-        print("error in next_day_pred", e)
-        raise e
\ No newline at end of file
+        logger.error(f"Error in next_day_pred: {e}")
+        raise e
+
+
+def multi_horizon_pred(ticker, horizon=5):
+    """
+    Forecast the next `horizon` business days in one request.
+
+    The model is rolled forward autoregressively: each predicted close is
+    appended as a flat OHLC bar (last volume carried forward) and the
+    indicators are recomputed on the in-memory 100-day frame, reusing the
+    fetched data, fitted scalers and loaded model from the first step.
+    Bands are the adjusted prediction +/- Std_Dev * sqrt(step), assuming
+    residuals compound like a random walk.
+    """
+    try:
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}, got {horizon}")
+
+        state = _load_next_day_state(ticker)
+        ohlcv = state["ohlcv"][['Open', 'High', 'Low', 'Close', 'Volume']]
+        features = state["features"]
+        std_dev = state["stats"]['Std_Dev']
+        last_close = float(features['Close'].iloc[-1])
+        last_volume = ohlcv['Volume'].iloc[-1]
+
+        path = []
+        for step in range(1, horizon + 1):
+            y_pred = _predict_from_features(state, features)
+            adjusted_pred, _ = _adjust_prediction(y_pred, state["stats"])
+            band = std_dev * np.sqrt(step)
+            next_date = ohlcv.index[-1] + pd.offsets.BDay(1)
+            path.append({
+                "date": next_date.strftime('%Y-%m-%d'),
+                "step": step,
+                "predicted_price": float(adjusted_pred),
+                "lower_bound": float(adjusted_pred - band),
+                "upper_bound": float(adjusted_pred + band),
+                "signal": _trading_signal(adjusted_pred, last_close),
+            })
+
+            if step < horizon:
+                # Feed the raw prediction back as the next bar
+                next_bar = pd.DataFrame(
+                    {"Open": [y_pred], "High": [y_pred], "Low": [y_pred], "Close": [y_pred], "Volume": [last_volume]},
+                    index=pd.DatetimeIndex([next_date], name=ohlcv.index.name),
+                )
+                ohlcv = pd.concat([ohlcv, next_bar])
+                with span("multi_horizon_pred", "indicators"):
+                    features = build_indicator_frame(ohlcv, adj_close_first=False)
+
+        return {
+            "ticker": ticker,
+            "previous_day_price": last_close,
+            "horizon": horizon,
+            "path": path,
+        }
+    except Exception as e:
+        logger.error(f"Error in multi_horizon_pred: {e}")
+        raise e
@@ -0,0 +1,100 @@
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.backtesting_signals import store_ohlcv_data
+from src.market_data import market_data
+from src.metrics import span
+from src.universe import get_universe
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_START_DATE = datetime(2021, 7, 7)  # Same start as signal_generate
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+EXCHANGE_TIMEZONES = {".NS": "Asia/Kolkata", ".BO": "Asia/Kolkata"}
+DEFAULT_TIMEZONE = "Asia/Kolkata"  # The universe is NSE-listed
+
+# Result of the most recent prefetch_universe run
+last_prefetch: Dict = {}
+
+
+def _exchange_timezone(ticker: str) -> str:
+    suffix = ticker[ticker.rfind("."):] if "." in ticker else ""
+    return EXCHANGE_TIMEZONES.get(suffix, DEFAULT_TIMEZONE)
+
+
+def download_prices(tickers: List[str], save: bool = True, **kwargs) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    Fetch daily OHLCV for many tickers in one batched yfinance download.
+
+    kwargs are passed to yf.download (start/end or period/interval). Each
+    ticker's frame is split out and, with save=True, written to the
+    per-ticker price store data/{ticker}_OHLCV.csv exactly as
+    get_stocks_data does. yf.download returns a tz-naive index, so dates
+    are localized to the exchange timezone to match Ticker.history.
+    Returns ({ticker: ohlcv frame with a Date column}, {ticker: error
+    message}) so one bad ticker never fails the batch.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices, failures = {}, {}
+    if not tickers:
+        return prices, failures
+
+    with span("bulk_prices", "data_fetch"):
+        data = market_data.download(tickers, **kwargs)
+
+    with span("bulk_prices", "split"):
+        for ticker in tickers:
+            try:
+                if ticker not in data.columns.get_level_values(0):
+                    raise ValueError("not returned by yfinance")
+                frame = data[ticker].dropna(how='all')
+                missing = [col for col in OHLCV_COLUMNS if col not in frame.columns]
+                if missing:
+                    raise ValueError(f"missing columns {missing}")
+                if frame.empty:
+                    raise ValueError("no rows in the requested range")
+                if frame.index.tz is None:
+                    frame.index = frame.index.tz_localize(_exchange_timezone(ticker))
+                frame.index.name = 'Date'
+                if save:
+                    prices[ticker] = store_ohlcv_data(ticker, frame)
+                else:
+                    prices[ticker] = frame[OHLCV_COLUMNS].reset_index()
+            except Exception as e:
+                failures[ticker] = str(e)
+                logger.warning(f"Bulk download failed for {ticker}: {e}")
+
+    logger.info(f"Bulk download: {len(prices)} tickers ok, {len(failures)} failed")
+    return prices, failures
+
+
+def prefetch_universe(tickers: Optional[List[str]] = None, start_date: datetime = PREFETCH_START_DATE,
+                      end_date: Optional[datetime] = None) -> Dict:
+    """Refresh the price store for the whole universe in one batched download."""
+    tickers = tickers or get_universe()
+    end_date = end_date or datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    prices, failures = download_prices(
+        tickers, start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d')
+    )
+    result = {
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "requested": len(tickers),
+        "succeeded": {ticker: len(frame) for ticker, frame in prices.items()},
+        "failed": failures,
+    }
+    last_prefetch.clear()
+    last_prefetch.update(result)
+    return result
+
+
+if __name__ == "__main__":
+    # Run from backend/: python -m src.bulk_prices
+    parser = argparse.ArgumentParser(description="Prefetch OHLCV for many tickers in one batched download")
+    parser.add_argument("--tickers", nargs="*", help="Tickers to fetch (default: the Quartely_merged universe)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(prefetch_universe(args.tickers))
@@ -1,16 +1,20 @@
-import yfinance as yf
 import pandas as pd
+import logging
+from src.metrics import span
+from src.market_data import market_data
+
+logger = logging.getLogger(__name__)
 
 def fetch_stock_data(company_ticker, period='1y', interval='1d'):
   
     try:
-        stock = yf.Ticker(company_ticker)
-        data = stock.history(period=period, interval=interval)
-        print(data  )
+        with span("fetch_stock_data", "data_fetch"):
+            data = market_data.history(company_ticker, period=period, interval=interval)
+        logger.debug(f"Fetched {len(data)} rows for {company_ticker}")
         if data.empty:
             raise ValueError(f"No data returned for ticker '{company_ticker}'")
         data.reset_index(inplace=True)  # Make date a column
         return data
     except Exception as e:
-        print(f"❌ Error fetching data for {company_ticker}: {e}")
+        logger.error(f"❌ Error fetching data for {company_ticker}: {e}")
         return None
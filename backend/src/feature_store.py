@@ -0,0 +1,99 @@
+import glob
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import ta
+
+from src.file_writer import writer
+from src.metrics import record_cache
+
+FEATURE_CACHE_FOLDER = os.path.join("outputs", "feature_cache")
+MAX_MEMORY_ENTRIES = 64
+
+_memory_cache = OrderedDict()  # {(ticker, layout, fingerprint): DataFrame}
+_lock = threading.Lock()
+
+
+def add_technical_indicators(df):
+    """Add the momentum/volume indicators used by the models to an OHLCV frame (in place)."""
+    df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
+    stochastic = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
+    df['Stochastic_K'] = stochastic.stoch()
+    df['Stochastic_D'] = stochastic.stoch_signal()
+    df['Williams_%R'] = ta.momentum.WilliamsRIndicator(df['High'], df['Low'], df['Close'], lbp=14).williams_r()
+    df['MFI'] = ta.volume.MFIIndicator(df['High'], df['Low'], df['Close'], df['Volume'], window=14).money_flow_index()
+    df['AD_Line'] = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], df['Volume']).acc_dist_index()
+    df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
+    return df
+
+
+def build_indicator_frame(ohlcv_data: pd.DataFrame, adj_close_first: bool = True) -> pd.DataFrame:
+    """Uncached copy of a date-indexed OHLCV frame with 'Adj Close' and indicators added, NaN rows dropped."""
+    features = ohlcv_data.copy()
+    if adj_close_first:
+        features['Adj Close'] = features['Close']
+    add_technical_indicators(features)
+    if not adj_close_first:
+        features['Adj Close'] = features['Close']
+    features.dropna(inplace=True)
+    return features
+
+
+def ohlcv_fingerprint(ohlcv_data: pd.DataFrame) -> str:
+    """Content hash of an OHLCV frame (index and values), used as the cache key."""
+    hashed = pd.util.hash_pandas_object(ohlcv_data, index=True).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def _cache_path(ticker: str, layout: str, fingerprint: str) -> str:
+    return os.path.join(FEATURE_CACHE_FOLDER, f"{ticker}_{layout}_{fingerprint}.pkl")
+
+
+def get_indicator_frame(ticker: str, ohlcv_data: pd.DataFrame, adj_close_first: bool = True) -> pd.DataFrame:
+    """
+    Date-indexed OHLCV + technical indicator frame (NaN rows dropped), cached
+    in memory and under outputs/feature_cache/ by content hash.
+
+    adj_close_first selects the column layout: technical_predictions adds
+    'Adj Close' before the indicators, next_day_pred after them, and the
+    selected feature indices refer to those column positions.
+    The returned frame is shared; callers must copy before mutating it.
+    """
+    df = ohlcv_data.set_index('Date') if 'Date' in ohlcv_data.columns else ohlcv_data
+    layout = "adjfirst" if adj_close_first else "adjlast"
+    key = (ticker, layout, ohlcv_fingerprint(df))
+
+    with _lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            record_cache("indicator_frames", "memory_hit")
+            return _memory_cache[key]
+
+    cache_path = _cache_path(*key)
+    if os.path.exists(cache_path):
+        features = pd.read_pickle(cache_path)
+        record_cache("indicator_frames", "disk_hit")
+    else:
+        features = build_indicator_frame(df, adj_close_first=adj_close_first)
+        record_cache("indicator_frames", "miss")
+
+        def write(tmp_path):
+            # Keep only the newest fingerprint per ticker/layout on disk
+            for stale_path in glob.glob(_cache_path(ticker, layout, "*")):
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+            features.to_pickle(tmp_path)
+
+        # Persisted off the request path; the memory cache serves this frame meanwhile
+        writer.submit(cache_path, write)
+
+    with _lock:
+        _memory_cache[key] = features
+        while len(_memory_cache) > MAX_MEMORY_ENTRIES:
+            _memory_cache.popitem(last=False)
+    return features
@@ -0,0 +1,131 @@
+import atexit
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from src.metrics import span
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCKS_FOLDER = os.path.join("outputs", "locks")
+FLUSH_TIMEOUT_SECONDS = 30
+
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def _lock_file_path(path: str) -> str:
+    # Named from the full path so same-named files in different folders get separate locks
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(LOCKS_FOLDER, f"{os.path.basename(path)}-{digest}.lock")
+
+
+@contextmanager
+def path_lock(path: str):
+    """
+    Serialize writers of one file: a thread lock in-process plus an flock
+    across worker processes. The lock file is removed on release.
+    """
+    abs_path = os.path.abspath(path)
+    with _path_locks_guard:
+        lock = _path_locks.setdefault(abs_path, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        lock_path = _lock_file_path(abs_path)
+        os.makedirs(LOCKS_FOLDER, exist_ok=True)
+        while True:
+            lock_file = open(lock_path, "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have removed the file while we waited; lock the current one instead
+                if os.fstat(lock_file.fileno()).st_ino == os.stat(lock_path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+        try:
+            yield
+        finally:
+            os.remove(lock_path)
+            lock_file.close()
+
+
+def atomic_write(path: str, write: Callable[[str], None]):
+    """
+    Call write(tmp_path) and rename the result over path, so readers see
+    either the old file or the complete new one, never a truncated one.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with path_lock(path):
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class BackgroundWriter:
+    """
+    One thread per process that performs atomic writes off the request path.
+
+    submit() returns immediately. If a path already has a write queued,
+    the newer write replaces it, so a burst of requests for one ticker
+    costs a single write. write callables must only touch data the caller
+    will not mutate afterwards (pass a copy). Pending writes are flushed
+    on shutdown and at interpreter exit.
+    """
+
+    def __init__(self):
+        self._pending: "OrderedDict[str, Callable[[str], None]]" = OrderedDict()  # {path: write}
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, path: str, write: Callable[[str], None]):
+        with self._cond:
+            self._pending[path] = write
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path, write = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                with span("file_writer", "write"):
+                    atomic_write(path, write)
+                logger.debug(f"Wrote {path}")
+            except Exception as e:
+                logger.error(f"Background write to {path} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait until every submitted write is on disk; False if the timeout expired first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+
+writer = BackgroundWriter()
+atexit.register(writer.flush)
@@ -1,11 +1,14 @@
-import yfinance as yf
+import logging
+from src.metrics import span
+from src.market_data import market_data
+
+logger = logging.getLogger(__name__)
 
 def fetch_financial_data(ticker):
     try:
-        stock = yf.Ticker(ticker)
-        
         # Fetch income statement and get the latest available date
-        income_statement = stock.financials
+        with span("fetch_financial_data", "data_fetch"):
+            income_statement = market_data.financials(ticker)
         
         if income_statement.empty:
             raise ValueError(f"❌ No financial data available for '{ticker}'")
@@ -36,5 +39,5 @@ def fetch_financial_data(ticker):
         return financial_data
 
     except Exception as e:
-        print(f"❌ Error fetching financial data: {e}")
+        logger.error(f"❌ Error fetching financial data: {e}")
         return None
@@ -0,0 +1,137 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Hashable, List
+
+import pandas as pd
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+
+from src.metrics import UPSTREAM_CALLS, record_cache, span
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_REQUESTS = int(os.getenv("YF_MAX_CONCURRENCY", "4"))
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+MAX_EMPTY_RETRIES = 1  # Unknown tickers and empty ranges are legitimately empty
+
+
+class MarketDataClient:
+    """
+    Shared yfinance access for the whole process.
+
+    All calls go through one pooled requests.Session (keep-alive, so the TLS
+    handshake and Yahoo cookie/crumb are reused), at most
+    MAX_CONCURRENT_REQUESTS upstream calls run at once, failed calls are
+    retried with exponential backoff, and concurrent identical requests
+    (same method, ticker and arguments) share a single upstream call.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_REQUESTS, max_retries: int = MAX_RETRIES,
+                 backoff: float = BACKOFF_SECONDS):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._inflight = {}  # {request key: Future}
+        self._inflight_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _with_retries(self, method: str, call: Callable):
+        """
+        Run call() with backoff. yfinance usually reports throttling or a bad
+        response with an empty DataFrame rather than an exception, so an
+        empty frame is retried too, but at most MAX_EMPTY_RETRIES times;
+        after that the empty frame is returned and callers treat it as
+        "no data".
+        """
+        empty_retries = 0
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._semaphore, span("market_data", method):
+                    result = call()
+            except Exception as e:
+                UPSTREAM_CALLS.inc(service="yfinance", method=method, result="error")
+                if attempt == self.max_retries:
+                    raise
+                reason = str(e)
+            else:
+                if not (isinstance(result, pd.DataFrame) and result.empty):
+                    UPSTREAM_CALLS.inc(service="yfinance", method=method, result="ok")
+                    return result
+                UPSTREAM_CALLS.inc(service="yfinance", method=method, result="empty")
+                if attempt == self.max_retries or empty_retries >= MAX_EMPTY_RETRIES:
+                    return result
+                empty_retries += 1
+                reason = "empty response"
+            delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF_SECONDS) * (1 + random.random())
+            logger.warning(f"yfinance {method} failed ({reason}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _deduplicated(self, key: Hashable, method: str, call: Callable):
+        """Run call() once per key at a time; concurrent callers with the same key wait for that result."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            record_cache("market_data_inflight", "shared")
+            result = future.result()
+        else:
+            record_cache("market_data_inflight", "leader")
+            try:
+                result = self._with_retries(method, call)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+
+        # Callers mutate the frames they get back (reset_index(inplace=True), ...)
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+
+    def ticker(self, symbol: str) -> yf.Ticker:
+        return yf.Ticker(symbol, session=self.session)
+
+    def history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """Ticker.history(**kwargs) for one symbol."""
+        key = ("history", symbol, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+        return self._deduplicated(key, "history", lambda: self.ticker(symbol).history(**kwargs))
+
+    def download(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        """
+        yf.download for many symbols in one batched call; columns are
+        (symbol, field) for every requested symbol. Unlike history(), the
+        daily index is tz-naive (see bulk_prices.download_prices).
+        """
+        symbols = sorted(set(symbols))
+        key = ("download", tuple(symbols), tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+
+        def call():
+            data = yf.download(symbols, group_by="ticker", auto_adjust=True, progress=False,
+                               threads=True, session=self.session, **kwargs)
+            if not isinstance(data.columns, pd.MultiIndex):
+                # A single symbol comes back with flat columns
+                data = pd.concat({symbols[0]: data}, axis=1)
+            return data
+
+        return self._deduplicated(key, "download", call)
+
+    def financials(self, symbol: str) -> pd.DataFrame:
+        """Ticker.financials (annual income statement) for one symbol."""
+        return self._deduplicated(("financials", symbol), "financials", lambda: self.ticker(symbol).financials)
+
+
+market_data = MarketDataClient()
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: Optional[Dict] = None) -> str:
+    pairs = list(zip(labelnames, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = [(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, Dict] = {}  # {labels: {"counts": [...], "sum": float, "count": int}}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            entry["counts"][index] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), entry["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, {'le': le})} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {entry['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {entry['count']}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "shankh_http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+STAGE_LATENCY = Histogram(
+    "shankh_stage_duration_seconds", "Latency of pipeline stages (fetch, indicators, model load, inference, ...)",
+    ["component", "stage"]
+)
+STAGE_ERRORS = Counter("shankh_stage_errors_total", "Pipeline stages that raised", ["component", "stage"])
+CACHE_EVENTS = Counter("shankh_cache_events_total", "Cache lookups by cache and result", ["cache", "result"])
+UPSTREAM_CALLS = Counter(
+    "shankh_upstream_calls_total", "Upstream API attempts by service, method and result", ["service", "method", "result"]
+)
+EVENTS_PUBLISHED = Counter("shankh_events_published_total", "Signal events pushed to subscribers by kind", ["kind"])
+EVENTS_DROPPED = Counter("shankh_events_dropped_total", "Events dropped because a subscriber fell behind")
+
+METRICS = [REQUEST_LATENCY, STAGE_LATENCY, STAGE_ERRORS, CACHE_EVENTS, UPSTREAM_CALLS, EVENTS_PUBLISHED, EVENTS_DROPPED]
+
+
+@contextmanager
+def span(component: str, stage: str):
+    """Time a pipeline stage into shankh_stage_duration_seconds and log it at DEBUG."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(component=component, stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, component=component, stage=stage)
+        logger.debug(f"{component}.{stage} took {elapsed * 1000:.1f} ms")
+
+
+def record_cache(cache: str, result: str):
+    """Count a cache lookup, e.g. record_cache("tweets", "hit")."""
+    CACHE_EVENTS.inc(cache=cache, result=result)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
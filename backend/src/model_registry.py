@@ -0,0 +1,203 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.layers import Dense, Dot, Activation
+
+from src.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+MODELS_FOLDER = "models"
+PREDICTED_STATS_FILE = "predicted.csv"
+BUNDLES_FOLDER = "bundles"
+CURRENT_POINTER = "CURRENT"
+BUNDLE_STATS_FILE = "stats.json"
+
+
+# Attention layer (needed to load the model)
+def attention_layer(lstm_output):
+    attention = Dense(1, activation='tanh')(lstm_output)
+    attention = Activation('sigmoid')(attention)
+    context = Dot(axes=1)([attention, lstm_output])
+    return context
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class ModelRegistry:
+    """
+    Per-company model metadata index.
+
+    Holds the Keras model, the selected feature indices and the residual
+    stats from predicted.csv for every company, keyed by company name
+    (ticker without exchange suffix). Entries are reloaded when the
+    underlying file's modification time changes.
+
+    If models/bundles/{company}/CURRENT names a published bundle version,
+    the model, features and stats are read from that bundle directory
+    instead of the flat models/{company}.h5 files. Bundles are immutable
+    and CURRENT is swapped with os.replace, so a reader never sees a model
+    from one version paired with features from another.
+    """
+
+    def __init__(self, models_folder: str = MODELS_FOLDER):
+        self.models_folder = models_folder
+        self.stats_path = os.path.join(models_folder, PREDICTED_STATS_FILE)
+        self._lock = threading.RLock()
+        self._company_locks: Dict[str, threading.Lock] = {}  # Serialize loads per company only
+        self._stats: Dict[str, Dict] = {}  # {company: {column: value}}
+        self._stats_mtime: Optional[float] = None
+        self._models: Dict[str, Dict] = {}  # {company: {"model", "features", "version", paths and mtimes}}
+        self._bundle_stats: Dict = {}  # {(company, version): stats}
+
+    def bundle_folder(self, company: str, version: Optional[str] = None) -> str:
+        folder = os.path.join(self.models_folder, BUNDLES_FOLDER, company)
+        return os.path.join(folder, version) if version else folder
+
+    def current_version(self, company: str) -> Optional[str]:
+        """Version name of the published bundle for a company, or None for flat model files."""
+        pointer_path = os.path.join(self.bundle_folder(company), CURRENT_POINTER)
+        try:
+            with open(pointer_path, 'r', encoding='utf-8') as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        return version or None
+
+    def _resolve(self, company: str):
+        """Return (version, model_path, features_path, bundle_stats_path) for a company."""
+        version = self.current_version(company)
+        if version:
+            folder = self.bundle_folder(company, version)
+            return (version,
+                    os.path.join(folder, f"{company}.h5"),
+                    os.path.join(folder, f"{company}_features.npy"),
+                    os.path.join(folder, BUNDLE_STATS_FILE))
+        return (None,
+                os.path.join(self.models_folder, f"{company}.h5"),
+                os.path.join(self.models_folder, f"{company}_features.npy"),
+                None)
+
+    def _companies_on_disk(self):
+        companies = set()
+        if os.path.isdir(self.models_folder):
+            companies |= {f[:-len(".h5")] for f in os.listdir(self.models_folder) if f.endswith(".h5")}
+        bundles_root = os.path.join(self.models_folder, BUNDLES_FOLDER)
+        if os.path.isdir(bundles_root):
+            companies |= {c for c in os.listdir(bundles_root) if self.current_version(c)}
+        return sorted(companies)
+
+    def load_all(self):
+        """Load residual stats and every model/feature pair found in the models folder."""
+        self.refresh_stats()
+        for company in self._companies_on_disk():
+            try:
+                self.get_model(company)
+            except Exception as e:
+                logger.error(f"Error loading model for {company}: {e}")
+
+    def refresh_stats(self):
+        """Re-read predicted.csv if it changed since the last load."""
+        mtime = _mtime(self.stats_path)
+        with self._lock:
+            if mtime is not None and mtime == self._stats_mtime:
+                return
+            if mtime is None:
+                self._stats = {}
+                self._stats_mtime = None
+                return
+            predicted_df = pd.read_csv(self.stats_path)
+            self._stats = {
+                row["Company"]: {k: v for k, v in row.items() if k != "Company"}
+                for row in predicted_df.to_dict(orient="records")
+            }
+            self._stats_mtime = mtime
+
+    def get_stats(self, company: str) -> Dict:
+        """Return the residual stats row (Std_Dev, Mean_Residuals, ...) for a company."""
+        version, _, _, bundle_stats_path = self._resolve(company)
+        if bundle_stats_path and os.path.exists(bundle_stats_path):
+            # Bundles are immutable, so their stats are cached per version
+            key = (company, version)
+            with self._lock:
+                if key not in self._bundle_stats:
+                    with open(bundle_stats_path, 'r', encoding='utf-8') as f:
+                        self._bundle_stats[key] = json.load(f)
+                return self._bundle_stats[key]
+        self.refresh_stats()
+        with self._lock:
+            if self._stats_mtime is None:
+                raise FileNotFoundError(f"Predicted CSV file not found: {self.stats_path}")
+            stats = self._stats.get(company)
+        if stats is None:
+            raise ValueError(f"No stats found for company: {company}")
+        return stats
+
+    def get_model(self, company: str):
+        """Return (model, selected_features) for a company, reloading changed files."""
+        version, model_path, features_path, _ = self._resolve(company)
+        model_mtime = _mtime(model_path)
+        features_mtime = _mtime(features_path)
+        if features_mtime is None:
+            raise FileNotFoundError(f"Selected features file not found: {features_path}")
+        if model_mtime is None:
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+
+        with self._lock:
+            company_lock = self._company_locks.setdefault(company, threading.Lock())
+        # Loading happens outside the shared lock, so one company's reload
+        # never blocks lookups for the others; the new entry is swapped in whole
+        with company_lock:
+            with self._lock:
+                entry = self._models.get(company)
+            if entry is None or entry["model_path"] != model_path or entry["model_mtime"] != model_mtime:
+                record_cache("models", "miss")
+                model = tf.keras.models.load_model(
+                    model_path,
+                    custom_objects={'attention_layer': attention_layer, 'mse': tf.keras.losses.MeanSquaredError()}
+                )
+                entry = {"model": model, "model_path": model_path, "model_mtime": model_mtime,
+                         "version": version, "features": None, "features_path": None, "features_mtime": None}
+            else:
+                record_cache("models", "hit")
+            if entry["features_path"] != features_path or entry["features_mtime"] != features_mtime:
+                entry = dict(entry, features=np.load(features_path), features_path=features_path,
+                             features_mtime=features_mtime)
+            with self._lock:
+                self._models[company] = entry
+            return entry["model"], entry["features"]
+
+    def metadata(self, company: Optional[str] = None) -> Dict:
+        """Serializable view of the index, optionally restricted to one company."""
+        self.refresh_stats()
+        with self._lock:
+            companies = set(self._stats) | set(self._models)
+            if company is not None:
+                companies &= {company}
+            result = {}
+            for name in sorted(companies):
+                entry = self._models.get(name)
+                stats = self._stats.get(name, {})
+                if entry is not None and entry["version"]:
+                    stats = self._bundle_stats.get((name, entry["version"]), stats)
+                result[name] = {
+                    "model_loaded": entry is not None,
+                    "version": entry["version"] if entry is not None else None,
+                    "selected_features": entry["features"].tolist() if entry is not None else None,
+                    "stats": {k: float(v) if isinstance(v, (int, float, np.number)) else v for k, v in stats.items()},
+                }
+            return result
+
+
+registry = ModelRegistry()
@@ -0,0 +1,160 @@
+import contextvars
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import re
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILES_FOLDER = os.path.join("outputs", "profiles")
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SKIPPED_HEADER = "X-Profile-Skipped"
+PROFILE_QUERY_PARAM = "profile"
+STATS_LINES = 60
+
+# {"id": profile id, "skipped": reason or None} of the current request when profiling was requested, else None
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+# cProfile is interpreter-wide on Python 3.12+ (sys.monitoring), so one profiled request at a time
+_cprofile_lock = threading.Lock()
+# TensorFlow allows a single profiler session per process
+_tf_profiler_lock = threading.Lock()
+_PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def profiling_requested(headers, query_params) -> bool:
+    """True when the request carries X-Profile: 1 or ?profile=1."""
+    value = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+    return value is not None and value.lower() in ("1", "true", "yes", "cprofile")
+
+
+@contextmanager
+def profile_request():
+    """
+    Mark the current request as profiled; yields {"id", "skipped"}. The
+    endpoint sets "skipped" when its profile could not be taken.
+    """
+    profile = {"id": uuid.uuid4().hex, "skipped": None}
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def profiled(fn):
+    """
+    Run a sync endpoint under cProfile when its request asked for profiling.
+
+    Disabled requests only pay for one ContextVar lookup. The stats are
+    written to outputs/profiles/{id}.prof (raw) and {id}.txt (top functions
+    by cumulative time). Only one request per process is profiled at a
+    time; a concurrent one runs unprofiled and is marked skipped. On
+    Python 3.12+ the profile can still include other threads' calls.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return fn(*args, **kwargs)
+        if not _cprofile_lock.acquire(blocking=False):
+            profile["skipped"] = "another request is being profiled"
+            return fn(*args, **kwargs)
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # Another profiling tool (debugger, coverage) is active
+                profile["skipped"] = str(e)
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                _save_profile(profiler, profile["id"], fn.__name__)
+        finally:
+            _cprofile_lock.release()
+
+    return wrapper
+
+
+def _save_profile(profiler: cProfile.Profile, profile_id: str, name: str):
+    try:
+        os.makedirs(PROFILES_FOLDER, exist_ok=True)
+        profiler.dump_stats(os.path.join(PROFILES_FOLDER, f"{profile_id}.prof"))
+        summary = io.StringIO()
+        summary.write(f"endpoint: {name}\n")
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(STATS_LINES)
+        with open(os.path.join(PROFILES_FOLDER, f"{profile_id}.txt"), "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        logger.info(f"Saved profile {profile_id} for {name}")
+    except Exception as e:
+        logger.error(f"Error saving profile {profile_id}: {e}")
+
+
+@contextmanager
+def tf_trace():
+    """
+    Capture TensorFlow op timings into outputs/profiles/{id}_tf/ for a profiled request.
+
+    No-op when the request is not profiled or another trace is already running.
+    """
+    profile = _current_profile.get()
+    if profile is None or profile["skipped"] or not _tf_profiler_lock.acquire(blocking=False):
+        yield
+        return
+    import tensorflow as tf
+    try:
+        tf.profiler.experimental.start(os.path.join(PROFILES_FOLDER, f"{profile['id']}_tf"))
+        try:
+            yield
+        finally:
+            tf.profiler.experimental.stop()
+    finally:
+        _tf_profiler_lock.release()
+
+
+def list_profiles() -> List[Dict]:
+    if not os.path.isdir(PROFILES_FOLDER):
+        return []
+    profiles = []
+    for file_name in os.listdir(PROFILES_FOLDER):
+        profile_id, ext = os.path.splitext(file_name)
+        if ext != ".prof":
+            continue
+        path = os.path.join(PROFILES_FOLDER, file_name)
+        profiles.append({
+            "profile_id": profile_id,
+            "created": os.path.getmtime(path),
+            "has_tf_trace": os.path.isdir(os.path.join(PROFILES_FOLDER, f"{profile_id}_tf")),
+        })
+    return sorted(profiles, key=lambda p: p["created"], reverse=True)
+
+
+def profile_path(profile_id: str, kind: str = "stats") -> Optional[str]:
+    """Path of a stored profile artifact ('stats', 'prof' or 'tf' zip), or None if missing/invalid."""
+    if not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    if kind == "stats":
+        path = os.path.join(PROFILES_FOLDER, f"{profile_id}.txt")
+    elif kind == "prof":
+        path = os.path.join(PROFILES_FOLDER, f"{profile_id}.prof")
+    elif kind == "tf":
+        trace_dir = os.path.join(PROFILES_FOLDER, f"{profile_id}_tf")
+        if not os.path.isdir(trace_dir):
+            return None
+        path = os.path.join(PROFILES_FOLDER, f"{profile_id}_tf.zip")
+        if not os.path.exists(path):
+            shutil.make_archive(path[:-len(".zip")], "zip", trace_dir)
+    else:
+        return None
+    return path if os.path.exists(path) else None
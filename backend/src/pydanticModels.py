@@ -1,5 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
+from src.backtesting_signals import MAX_HORIZON
+
+MAX_TICKERS_PER_REQUEST = 100
 
 
 
@@ -10,4 +13,16 @@ class StockRequest(BaseModel):
     interval: Optional[str] = '1d'
 
 class Ticker(BaseModel):
-    ticker:str
\ No newline at end of file
+    ticker:str
+
+class ForecastRequest(BaseModel):
+    ticker: str
+    horizon: int = Field(5, ge=1, le=MAX_HORIZON)
+
+class BulkStockRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=MAX_TICKERS_PER_REQUEST)
+    period: Optional[str] = '1y'
+    interval: Optional[str] = '1d'
+
+class BacktestJobRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=MAX_TICKERS_PER_REQUEST)
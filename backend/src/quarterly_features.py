@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from xgboost import XGBRegressor
+
+from src.file_writer import writer
+from src.metrics import record_cache, span
+from src.universe import QUARTERLY_FOLDER, QUARTERLY_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+QUARTERLY_CACHE_FOLDER = os.path.join("outputs", "quarterly_features")
+
+FINANCIAL_INDICATORS = [
+    "Total Revenue", "Oper Rev", "Other Income", "Operating Expenses",
+    "Operating Profit", "Profit Before Tax", "Tax", "Net Profit",
+    "Basic EPS", "Net profit TTM", "Basic EPS TTM", "Qavg_ATR_14"
+]
+LAGGED_FEATURES = [f"Lagged_{col}" for col in FINANCIAL_INDICATORS]
+FEATURES = LAGGED_FEATURES + ["Prev_Qavg_Close", "Prev_Qstd_Close"]
+TARGET = "Qavg_Close"
+REQUIRED_COLUMNS = FINANCIAL_INDICATORS + ["Date", "Qavg_Close", "Qstd_Close", "Prev_Qavg_Close", "Prev_Qstd_Close"]
+
+_materialized: Dict[str, Dict] = {}  # {company: entry}, see _materialize
+_company_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def quarterly_path(ticker: str) -> str:
+    return os.path.join(QUARTERLY_FOLDER, f"{ticker.split('.')[0]}{QUARTERLY_SUFFIX}")
+
+
+def load_quarterly_data(path: str) -> pd.DataFrame:
+    """Read a Quartely_merged CSV, sorted by quarter and validated."""
+    if not os.path.exists(path):
+        raise ValueError(f"Quarterly data file not found at {path}")
+    df = pd.read_csv(path)
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in quarterly data: {missing_columns}")
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Quarter"] = df["Date"].dt.to_period("Q")
+    return df.sort_values("Quarter").reset_index(drop=True)
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    # One hash per quarter row, to tell an appended quarter from an edited history
+    return pd.util.hash_pandas_object(df.drop(columns="Quarter"), index=False).values
+
+
+def _lagged_rows(raw: pd.DataFrame) -> pd.DataFrame:
+    """Lagged features for every row of raw except the first (which only supplies the lag)."""
+    df = raw.copy()
+    df[LAGGED_FEATURES] = df[FINANCIAL_INDICATORS].shift(1).values
+    return df.iloc[1:].dropna()
+
+
+def _predict(model, df: pd.DataFrame) -> pd.DataFrame:
+    df["Predicted_Qavg_Close"] = model.predict(df[FEATURES])
+    df["Lower_Bound"] = df["Predicted_Qavg_Close"] - df["Qstd_Close"]
+    df["Upper_Bound"] = df["Predicted_Qavg_Close"] + df["Qstd_Close"]
+    return df
+
+
+def _next_quarter(model, last_quarter: pd.Series) -> pd.DataFrame:
+    next_quarter = pd.DataFrame({
+        "Quarter": [last_quarter["Quarter"] + 1],
+        "Prev_Qavg_Close": [last_quarter["Qavg_Close"]],
+        "Prev_Qstd_Close": [last_quarter["Qstd_Close"]],
+        **{f"Lagged_{col}": [last_quarter[col]] for col in FINANCIAL_INDICATORS}
+    })
+    next_quarter["Qstd_Close"] = last_quarter["Qstd_Close"]
+    return _predict(model, next_quarter)
+
+
+def _fit_model(df: pd.DataFrame, model_path: Optional[str]):
+    if model_path and os.path.exists(model_path):
+        return joblib.load(model_path)
+    # The newest quarter is held out, as the plot shows it as the latest prediction
+    train_df = df.iloc[:-1]
+    model = XGBRegressor(n_estimators=50, max_depth=2, learning_rate=0.05, random_state=42)
+    model.fit(train_df[FEATURES], train_df[TARGET])
+    return model
+
+
+def _cache_path(company: str) -> str:
+    return os.path.join(QUARTERLY_CACHE_FOLDER, f"{company}.joblib")
+
+
+def _persist(company: str, entry: Dict):
+    # Entries are never mutated after _materialize builds them, so the background writer can pickle it as is
+    writer.submit(_cache_path(company), lambda tmp_path: joblib.dump(entry, tmp_path))
+
+
+def _materialize(company: str, path: str, model_path: Optional[str]) -> Dict:
+    """
+    Bring the cached entry for a company up to date with its merged CSV.
+
+    entry = {"mtime", "hashes" (raw rows), "model_path", "model",
+    "frame" (historical quarters with lagged features and predictions),
+    "next_quarter" (one-row forecast)}.
+    """
+    entry = _materialized.get(company)
+    if entry is None and os.path.exists(_cache_path(company)):
+        try:
+            entry = joblib.load(_cache_path(company))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable quarterly cache for {company}: {e}")
+
+    mtime = os.path.getmtime(path)
+    if entry is not None and entry["mtime"] == mtime and entry["model_path"] == model_path:
+        record_cache("quarterly_features", "hit")
+        return entry
+
+    raw = load_quarterly_data(path)
+    hashes = _row_hashes(raw)
+    old = entry["hashes"] if entry is not None and entry["model_path"] == model_path else None
+
+    if old is not None and len(hashes) >= len(old) and np.array_equal(hashes[:len(old)], old):
+        if len(hashes) == len(old):
+            # Touched but unchanged
+            record_cache("quarterly_features", "hit")
+            entry = dict(entry, mtime=mtime)
+        else:
+            # New quarters appended: lag and predict only those rows, keeping the fitted model
+            record_cache("quarterly_features", "incremental")
+            with span("quarterly_features", "incremental"):
+                new_rows = _predict(entry["model"], _lagged_rows(raw.iloc[len(old) - 1:]))
+                frame = pd.concat([entry["frame"], new_rows], ignore_index=True)
+                entry = dict(entry, mtime=mtime, hashes=hashes, frame=frame,
+                             next_quarter=_next_quarter(entry["model"], frame.iloc[-1]))
+    else:
+        # First build, or history was edited: refit and predict every quarter
+        record_cache("quarterly_features", "miss")
+        with span("quarterly_features", "rebuild"):
+            frame = _lagged_rows(raw).reset_index(drop=True)
+            model = _fit_model(frame, model_path)
+            frame = _predict(model, frame)
+            entry = {"mtime": mtime, "hashes": hashes, "model_path": model_path, "model": model,
+                     "frame": frame, "next_quarter": _next_quarter(model, frame.iloc[-1])}
+
+    _persist(company, entry)
+    _materialized[company] = entry
+    return entry
+
+
+def get_quarterly_predictions(ticker: str, quarterly_file_path: Optional[str] = None,
+                              model_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    Quarterly frame with lagged fundamentals, Predicted_Qavg_Close and
+    Lower/Upper_Bound for every historical quarter plus a next-quarter row.
+
+    Materialized once per dataset version (in memory and under
+    outputs/quarterly_features/). When quarters are appended to the merged
+    CSV only those rows are lagged and predicted, with the model fitted at
+    materialization; any edit to earlier rows triggers a full refit.
+    The returned frame is a copy and safe to mutate.
+    """
+    company = ticker.split(".")[0]
+    path = quarterly_file_path or quarterly_path(ticker)
+    if not os.path.exists(path):
+        raise ValueError(f"Quarterly data file not found at {path}")
+
+    with _lock:
+        company_lock = _company_locks.setdefault(company, threading.Lock())
+    with company_lock:
+        entry = _materialize(company, path, model_path)
+    return pd.concat([entry["frame"], entry["next_quarter"]], ignore_index=True)
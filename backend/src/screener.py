@@ -0,0 +1,223 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.metrics import span
+from src.universe import get_universe
+
+logger = logging.getLogger(__name__)
+
+OUTPUTS_FOLDER = "outputs"
+FINANCIAL_SIGNALS_FOLDER = "financial_signals"
+TWEETS_FOLDER = os.path.join("data", "tweets_data")
+PRICES_FOLDER = "data"
+REFRESH_INTERVAL = 30  # Seconds between checks for changed files
+SIGNAL_NAMES = {1: "Buy", 0: "Hold", -1: "Sell"}
+SORT_FIELDS = ("ticker", "sentiment_score", "upside_pct", "last_close", "technical_signal", "financial_signal")
+
+
+def _company(ticker: str) -> str:
+    return ticker.split(".")[0]
+
+
+def _signal_value(value) -> Optional[int]:
+    if value is None or pd.isna(value):
+        return None
+    return int(value)
+
+
+def _parse_signal(name: Optional[str]) -> Optional[int]:
+    """'buy'/'sell'/'hold' or '1'/'-1'/'0' to a signal value."""
+    if name is None:
+        return None
+    for value, label in SIGNAL_NAMES.items():
+        if name.lower() in (label.lower(), str(value)):
+            return value
+    raise ValueError(f"Unknown signal '{name}', expected one of {list(SIGNAL_NAMES.values())}")
+
+
+class Screener:
+    """
+    In-memory table of the latest stored signals for every ticker.
+
+    Rows are seeded from the files the other endpoints already write
+    (outputs/technical_*_predictions.csv, financial_signals/*.csv,
+    data/tweets_data/*.json, data/*_OHLCV.csv) and re-read only when a
+    file's mtime changes. Files are re-checked on a background thread
+    every REFRESH_INTERVAL seconds and read outside the table lock, so
+    screen() and update() never wait on disk. Endpoints that compute
+    fresh predictions, signals or sentiment push them in with update(),
+    so screening never triggers per-ticker computation.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict] = {}  # {company: row}
+        self._mtimes: Dict[str, float] = {}  # {path: mtime}, only touched under _refresh_lock
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def _row(self, company: str) -> Dict:
+        row = self._rows.get(company)
+        if row is None:
+            row = self._rows[company] = {"ticker": f"{company}.NS", "company": company}
+        return row
+
+    # Loaders read one source file and return (company, fields), or None when it has no rows
+
+    def _load_technical(self, path: str):
+        ticker = os.path.basename(path)[len("technical_"):-len("_predictions.csv")]
+        df = pd.read_csv(path)
+        if df.empty:
+            return None
+        # Current files hold Date plus a column named after the ticker; older ones a Signal column
+        column = ticker if ticker in df.columns else "Signal"
+        last = df.dropna(subset=[column]).iloc[-1]
+        return _company(ticker), dict(ticker=ticker, technical_signal=_signal_value(last[column]),
+                                      technical_date=str(last["Date"])[:10])
+
+    def _load_financial(self, path: str):
+        company = os.path.basename(path)[:-len("_predictions_signals.csv")]
+        df = pd.read_csv(path)
+        if df.empty:
+            return None
+        actual = df.dropna(subset=["Qavg_Close"])
+        latest = actual.iloc[-1] if not actual.empty else df.iloc[-1]
+        forecast = df.iloc[-1]
+        return company, dict(
+            financial_signal=_signal_value(latest["Signal"]),
+            financial_quarter=str(latest["Quarter"]),
+            predicted_quarter=str(forecast["Quarter"]),
+            predicted_close=float(forecast["Predicted_Qavg_Close"]),
+            lower_bound=float(forecast["Lower_Bound"]),
+            upper_bound=float(forecast["Upper_Bound"]),
+        )
+
+    def _load_sentiment(self, path: str):
+        ticker = os.path.basename(path)[:-len(".json")]
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return _company(ticker), dict(ticker=ticker, sentiment_score=float(data.get("sentiment_score", 0.0)),
+                                      sentiment_signal=data.get("signal"))
+
+    def _load_price(self, path: str):
+        ticker = os.path.basename(path)[:-len("_OHLCV.csv")]
+        df = pd.read_csv(path, usecols=["Date", "Close"])
+        if df.empty:
+            return None
+        return _company(ticker), dict(ticker=ticker, last_close=float(df["Close"].iloc[-1]),
+                                      price_date=str(df["Date"].iloc[-1])[:10])
+
+    def refresh(self, force: bool = False):
+        """Re-read any source file that changed since the last refresh."""
+        if not force and time.monotonic() - self._last_refresh < REFRESH_INTERVAL:
+            return
+        # A forced refresh waits for one already running; otherwise that one suffices
+        if not self._refresh_lock.acquire(blocking=force):
+            return
+        try:
+            with span("screener", "refresh"):
+                sources = [
+                    (os.path.join(OUTPUTS_FOLDER, "technical_*_predictions.csv"), self._load_technical),
+                    (os.path.join(FINANCIAL_SIGNALS_FOLDER, "*_predictions_signals.csv"), self._load_financial),
+                    (os.path.join(TWEETS_FOLDER, "*.json"), self._load_sentiment),
+                    (os.path.join(PRICES_FOLDER, "*_OHLCV.csv"), self._load_price),
+                ]
+                updates, loaded = [], {}
+                for pattern, loader in sources:
+                    for path in glob.glob(pattern):
+                        try:
+                            # Taken before loading, so a write during the load is picked up next time
+                            mtime = os.path.getmtime(path)
+                            if self._mtimes.get(path) != mtime:
+                                updates.append(loader(path))
+                                # Only after a successful load, so a failed read is retried
+                                loaded[path] = mtime
+                        except Exception as e:
+                            logger.error(f"Error loading screener source {path}: {e}")
+
+                # Files are read above without the table lock; only the merge holds it
+                with self._lock:
+                    for company in map(_company, get_universe()):
+                        self._row(company)
+                    for update in updates:
+                        if update is not None:
+                            company, fields = update
+                            self._row(company).update(fields)
+                self._mtimes.update(loaded)
+            self._last_refresh = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def start(self):
+        """Start the background refresh thread (once per process)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._refresh_loop, name="screener-refresh", daemon=True)
+            self._thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(REFRESH_INTERVAL)
+            try:
+                self.refresh(force=True)
+            except Exception as e:
+                logger.error(f"Screener refresh failed: {e}")
+
+    def update(self, ticker: str, **fields):
+        """Merge freshly computed values for a ticker into its row."""
+        with self._lock:
+            row = self._row(_company(ticker))
+            row["ticker"] = ticker
+            row.update(fields)
+            row["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+    def screen(self, technical: Optional[str] = None, financial: Optional[str] = None,
+               sentiment: Optional[str] = None, min_sentiment: Optional[float] = None,
+               sort_by: str = "ticker", descending: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """Filter and rank the table; signal filters accept buy/hold/sell."""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{sort_by}', expected one of {list(SORT_FIELDS)}")
+        technical_value, financial_value = _parse_signal(technical), _parse_signal(financial)
+
+        if not self._last_refresh:
+            # Not seeded yet (app startup did not run); later refreshes happen in the background
+            self.refresh(force=True)
+        self.start()
+        with self._lock:
+            rows = [dict(row) for row in self._rows.values()]
+
+        results = []
+        for row in rows:
+            # A live next-day signal takes precedence over the last backtest signal
+            current_technical = row.get("next_day_signal", row.get("technical_signal"))
+            if technical_value is not None and current_technical != technical_value:
+                continue
+            if financial_value is not None and row.get("financial_signal") != financial_value:
+                continue
+            if sentiment is not None and (row.get("sentiment_signal") or "").lower() != sentiment.lower():
+                continue
+            if min_sentiment is not None and (row.get("sentiment_score") is None or row["sentiment_score"] < min_sentiment):
+                continue
+            if row.get("last_close") and row.get("predicted_close") is not None:
+                row["upside_pct"] = (row["predicted_close"] - row["last_close"]) / row["last_close"] * 100
+            results.append(row)
+
+        # Rows missing the sort field go last in either direction
+        present = [r for r in results if r.get(sort_by) is not None]
+        missing = [r for r in results if r.get(sort_by) is None]
+        present.sort(key=lambda r: r[sort_by], reverse=descending)
+        results = present + missing
+        return results[:limit] if limit else results
+
+
+screener = Screener()
@@ -1,6 +1,9 @@
 import os
+import logging
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 # Path to sentiment data
 SENTIMENT_FILE = os.path.join(os.path.dirname(__file__), '../sentiment.csv')
 
@@ -20,7 +23,7 @@ def load_sentiment_data():
         return sentiment_dict
     
     except Exception as e:
-        print(f"❌ Error loading sentiment data: {e}")
+        logger.error(f"❌ Error loading sentiment data: {e}")
         return None
 
 
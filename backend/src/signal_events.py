@@ -0,0 +1,89 @@
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+from src.metrics import EVENTS_DROPPED, EVENTS_PUBLISHED
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 100  # Per-subscriber backlog; the oldest event is dropped when a client falls behind
+HEARTBEAT_SECONDS = 15
+
+
+def _company(ticker: str) -> str:
+    return ticker.split(".")[0].upper()
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, tickers: Optional[Iterable[str]]):
+        self.loop = loop
+        self.companies = {_company(t) for t in tickers} if tickers else None  # None = every ticker
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def wants(self, ticker: str) -> bool:
+        return self.companies is None or _company(ticker) in self.companies
+
+    def _put(self, event: Dict):
+        # Runs on the subscriber's event loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            EVENTS_DROPPED.inc()
+        self.queue.put_nowait(event)
+
+
+class SignalBroker:
+    """
+    Fan-out of freshly computed predictions, signals and sentiment to
+    server-sent-event subscribers.
+
+    publish() is safe to call from the worker threads sync endpoints run
+    in; events are handed to each subscriber's event loop with
+    call_soon_threadsafe. Subscribers only live in the worker process that
+    accepted their connection.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, tickers: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), tickers)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, ticker: str, kind: str, data: Dict):
+        event = {"ticker": ticker, "kind": kind, "data": data, "timestamp": datetime.now().isoformat(timespec="seconds")}
+        EVENTS_PUBLISHED.inc(kind=kind)
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.wants(ticker)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # Event loop already closed; the stream's finally block will unsubscribe it
+                pass
+
+    async def stream(self, subscription: Subscription, is_disconnected) -> AsyncIterator[str]:
+        """Yield SSE frames for a subscription until the client disconnects."""
+        try:
+            yield ": subscribed\n\n"
+            while not await is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['kind']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+broker = SignalBroker()
@@ -0,0 +1,266 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.preprocessing import MinMaxScaler
+from tensorflow.keras.models import Model
+from tensorflow.keras.layers import Input, Dense, LSTM, Bidirectional
+from xgboost import XGBRegressor
+
+from src.backtesting_signals import get_stocks_data
+from src.feature_store import add_technical_indicators
+from src.file_writer import atomic_write
+from src.model_registry import (
+    MODELS_FOLDER, PREDICTED_STATS_FILE, BUNDLES_FOLDER, CURRENT_POINTER, BUNDLE_STATS_FILE,
+    attention_layer,
+)
+from src.universe import get_universe
+
+TIME_STEPS = 10  # Must match the sequence length used in backtesting_signals
+N_SELECTED_FEATURES = 10
+TRAIN_START_DATE = datetime(2015, 1, 1)
+CHECKPOINT_FILE = os.path.join(MODELS_FOLDER, BUNDLES_FOLDER, "training_checkpoint.json")
+STATS_COLUMNS = ["Company", "Predicted_Next_Day", "RMSE", "MAE", "Std_Dev", "Mean_Residuals"]
+
+
+def build_model(time_steps: int, n_features: int, units: int = 64):
+    """BiLSTM with the attention_layer block, output shaped (samples, 1, 1) like the served models."""
+    inputs = Input(shape=(time_steps, n_features))
+    lstm_output = Bidirectional(LSTM(units, return_sequences=True))(inputs)
+    context = attention_layer(lstm_output)
+    outputs = Dense(1)(context)
+    model = Model(inputs=inputs, outputs=outputs)
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+
+def prepare_features(ohlcv_data: pd.DataFrame):
+    """
+    Build the scaled feature matrix exactly as technical_predictions does
+    (Adj Close added before the indicators, NaN rows dropped).
+    """
+    df = ohlcv_data.copy()
+    if 'Date' in df.columns:
+        df.set_index('Date', inplace=True)
+    df['Adj Close'] = df['Close']
+    add_technical_indicators(df)
+    df.dropna(inplace=True)
+
+    X = df.drop(columns=['Close']).values
+    y = df['Close'].values
+    scaler_X = MinMaxScaler()
+    X_scaled = scaler_X.fit_transform(X)
+    scaler_y = MinMaxScaler()
+    y_scaled = scaler_y.fit_transform(y.reshape(-1, 1)).flatten()
+    return X_scaled, y_scaled, y, scaler_y
+
+
+def select_features(X_scaled: np.ndarray, y_scaled: np.ndarray, n_features: int = N_SELECTED_FEATURES) -> np.ndarray:
+    """Rank columns by XGBoost importance and keep the top n (sorted by column index)."""
+    selector = XGBRegressor(n_estimators=100, max_depth=3, learning_rate=0.1, random_state=42)
+    selector.fit(X_scaled, y_scaled)
+    ranked = np.argsort(selector.feature_importances_)[::-1]
+    return np.sort(ranked[:min(n_features, X_scaled.shape[1])])
+
+
+def make_sequences(X: np.ndarray, y: np.ndarray, time_steps: int = TIME_STEPS):
+    """Windows of time_steps rows, each labelled with the close of the following day."""
+    n_samples = len(X) - time_steps
+    if n_samples <= 0:
+        raise ValueError(f"Input data has {len(X)} rows, but more than {time_steps} are required.")
+    idx = np.arange(time_steps)[None, :] + np.arange(n_samples)[:, None]
+    return X[idx], y[time_steps:]
+
+
+def init_worker():
+    # One intra-op thread per process so N workers do not oversubscribe the cores
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def train_company(ticker: str, version: str, start_date: datetime, end_date: datetime,
+                  epochs: int = 50, batch_size: int = 32, validation_split: float = 0.2) -> Dict:
+    """
+    Train one company's model and write its bundle to models/bundles/{company}/{version}/.
+
+    Runs inside a worker process. The bundle directory is assembled in a
+    temporary folder and renamed into place, so it either exists complete
+    or not at all. Returns the predicted.csv row for the company.
+    """
+    company_name = ticker.split(".")[0]
+    bundle_folder = os.path.join(MODELS_FOLDER, BUNDLES_FOLDER, company_name, version)
+    stats_path = os.path.join(bundle_folder, BUNDLE_STATS_FILE)
+    if os.path.exists(stats_path):
+        # Finished in an earlier, interrupted run
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            return {"Company": company_name, **json.load(f)}
+
+    ohlcv_data = get_stocks_data(ticker, start_date, end_date)
+    X_scaled, y_scaled, y, scaler_y = prepare_features(ohlcv_data)
+    selected_features = select_features(X_scaled, y_scaled)
+    X_seq, y_seq = make_sequences(X_scaled[:, selected_features], y_scaled)
+
+    split = int(len(X_seq) * (1 - validation_split))
+    if split <= 0 or split >= len(X_seq):
+        raise ValueError(f"Not enough data to train {company_name}: {len(X_seq)} sequences")
+    X_train, X_val = X_seq[:split], X_seq[split:]
+    y_train, y_val = y_seq[:split], y_seq[split:]
+
+    model = build_model(TIME_STEPS, X_seq.shape[2])
+    model.fit(
+        X_train, y_train.reshape(-1, 1, 1),
+        validation_data=(X_val, y_val.reshape(-1, 1, 1)),
+        epochs=epochs,
+        batch_size=batch_size,
+        shuffle=False,
+        verbose=0,
+        callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)],
+    )
+
+    # Residual stats on the hold-out window, in price units
+    val_pred = scaler_y.inverse_transform(model.predict(X_val, verbose=0)[:, -1, :]).flatten()
+    val_actual = scaler_y.inverse_transform(y_val.reshape(-1, 1)).flatten()
+    residuals = val_actual - val_pred
+    last_window = X_scaled[-TIME_STEPS:, selected_features].reshape(1, TIME_STEPS, -1)
+    next_day = scaler_y.inverse_transform(model.predict(last_window, verbose=0)[:, -1, :])[0, 0]
+    stats = {
+        "Predicted_Next_Day": float(next_day),
+        "RMSE": float(np.sqrt(np.mean(residuals ** 2))),
+        "MAE": float(np.mean(np.abs(residuals))),
+        "Std_Dev": float(np.std(residuals)),
+        "Mean_Residuals": float(np.mean(residuals)),
+    }
+
+    company_folder = os.path.dirname(bundle_folder)
+    os.makedirs(company_folder, exist_ok=True)
+    tmp_folder = tempfile.mkdtemp(prefix=f".{version}-", dir=company_folder)
+    try:
+        model.save(os.path.join(tmp_folder, f"{company_name}.h5"))
+        np.save(os.path.join(tmp_folder, f"{company_name}_features.npy"), selected_features)
+        with open(os.path.join(tmp_folder, BUNDLE_STATS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=4)
+        os.replace(tmp_folder, bundle_folder)
+    except Exception:
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+        raise
+
+    return {"Company": company_name, **stats}
+
+
+def publish_bundle(company_name: str, version: str):
+    """Point models/bundles/{company}/CURRENT at a finished bundle (atomic swap)."""
+    company_folder = os.path.join(MODELS_FOLDER, BUNDLES_FOLDER, company_name)
+    if not os.path.exists(os.path.join(company_folder, version, BUNDLE_STATS_FILE)):
+        raise FileNotFoundError(f"Bundle {version} for {company_name} is incomplete")
+
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+
+    atomic_write(os.path.join(company_folder, CURRENT_POINTER), write)
+
+
+def update_predicted_stats(rows: List[Dict]):
+    """Merge stats rows into models/predicted.csv, replacing existing companies (atomic rewrite)."""
+    stats_path = os.path.join(MODELS_FOLDER, PREDICTED_STATS_FILE)
+
+    def write(tmp_path):
+        # Merged under the file lock so concurrent updates don't drop each other's rows
+        new_df = pd.DataFrame(rows, columns=STATS_COLUMNS)
+        if os.path.exists(stats_path):
+            existing_df = pd.read_csv(stats_path)
+            existing_df = existing_df[~existing_df['Company'].isin(new_df['Company'])]
+            new_df = pd.concat([existing_df, new_df], ignore_index=True)
+        new_df.to_csv(tmp_path, index=False)
+
+    atomic_write(stats_path, write)
+
+
+def _load_checkpoint() -> Optional[Dict]:
+    if not os.path.exists(CHECKPOINT_FILE):
+        return None
+    with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_checkpoint(checkpoint: Dict):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=4)
+
+    atomic_write(CHECKPOINT_FILE, write)
+
+
+def run_pipeline(tickers: Optional[List[str]] = None, workers: Optional[int] = None,
+                 version: Optional[str] = None, resume: bool = True, epochs: int = 50,
+                 start_date: datetime = TRAIN_START_DATE, end_date: Optional[datetime] = None) -> Dict:
+    """
+    Retrain models for many companies in parallel and publish them as they finish.
+
+    Progress is checkpointed to models/bundles/training_checkpoint.json after
+    every company; with resume=True an interrupted run for the same version
+    skips the companies it already completed.
+    """
+    tickers = tickers or get_universe()
+    end_date = end_date or datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    checkpoint = _load_checkpoint() if resume else None
+    if checkpoint and (version == checkpoint["version"] or (version is None and not checkpoint.get("finished"))):
+        version = checkpoint["version"]
+    else:
+        version = version or datetime.now().strftime("%Y%m%d%H%M%S")
+        checkpoint = {"version": version, "completed": {}, "failed": {}, "finished": False}
+
+    pending = [t for t in tickers if t.split(".")[0] not in checkpoint["completed"]]
+    print(f"Training version {version}: {len(pending)} pending, {len(checkpoint['completed'])} already done")
+    _save_checkpoint(checkpoint)
+
+    workers = workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init_worker) as executor:
+        futures = {
+            executor.submit(train_company, ticker, version, start_date, end_date, epochs): ticker
+            for ticker in pending
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            company_name = ticker.split(".")[0]
+            try:
+                row = future.result()
+                publish_bundle(company_name, version)
+                update_predicted_stats([row])
+                checkpoint["completed"][company_name] = row
+                checkpoint["failed"].pop(company_name, None)
+                print(f"Trained {company_name}: RMSE={row['RMSE']:.3f} MAE={row['MAE']:.3f}")
+            except Exception as e:
+                checkpoint["failed"][company_name] = str(e)
+                print(f"Error training {company_name}: {e}")
+            _save_checkpoint(checkpoint)
+
+    checkpoint["finished"] = not checkpoint["failed"]
+    _save_checkpoint(checkpoint)
+    return checkpoint
+
+
+if __name__ == "__main__":
+    # Run from backend/: python -m src.training_pipeline --tickers RELIANCE.NS HDFCBANK.NS --workers 4
+    parser = argparse.ArgumentParser(description="Retrain per-company BiLSTM models in parallel")
+    parser.add_argument("--tickers", nargs="*", help="Tickers to train (default: the Quartely_merged universe)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--version", default=None, help="Bundle version name (default: timestamp or resumed run)")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    result = run_pipeline(args.tickers, workers=args.workers, version=args.version,
+                          resume=not args.no_resume, epochs=args.epochs)
+    print(json.dumps({"version": result["version"], "failed": result["failed"]}, indent=4))
@@ -7,9 +7,9 @@ import logging
 from time import time
 import json
 import os
+from src.metrics import span, record_cache
+from src.file_writer import writer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # List of Twitter API bearer tokens
@@ -68,7 +68,9 @@ class TwitterClient:
             tweets, cache_time = self.tweet_cache[query]
             if current_time - cache_time < self.cache_duration:
                 logger.info(f"Returning cached tweets for query: {query}")
+                record_cache("tweets", "hit")
                 return tweets
+        record_cache("tweets", "miss")
 
         end_time = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         start_time = end_time - timedelta(days=5)  # Twitter API allows 7-day search
@@ -78,15 +80,16 @@ class TwitterClient:
         while attempts < max_attempts:
             try:
                 client = self.get_client()
-                tweets = client.search_recent_tweets(
-                    query=query,
-                    start_time=start_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                    end_time=end_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                    tweet_fields=["created_at", "text", "source"],
-                    user_fields=["name", "username", "location", "verified", "description"],
-                    max_results=max_results,
-                    expansions='author_id'
-                )
+                with span("twitter_client", "tweet_search"):
+                    tweets = client.search_recent_tweets(
+                        query=query,
+                        start_time=start_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        end_time=end_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        tweet_fields=["created_at", "text", "source"],
+                        user_fields=["name", "username", "location", "verified", "description"],
+                        max_results=max_results,
+                        expansions='author_id'
+                    )
                 parsed_tweets = self.parse_tweepy_response(tweets) if tweets.data else []
                 # Cache the results
                 self.tweet_cache[query] = (parsed_tweets, current_time)
@@ -128,13 +131,14 @@ class TwitterClient:
         try:
             model = genai.GenerativeModel('gemini-1.5-flash')
             prompt = f"Decide whether a Tweet's sentiment is positive, neutral, or negative. Tweet:\n\n{tweet_text}\n\nSentiment:"
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=100
+            with span("twitter_client", "llm_sentiment"):
+                response = model.generate_content(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(
+                        temperature=0.7,
+                        max_output_tokens=100
+                    )
                 )
-            )
             return response.text.strip()
         except Exception as e:
             logger.error(f"Error generating sentiment: {e}")
@@ -154,9 +158,16 @@ class TwitterClient:
         """Save data to JSON file in data/tweets_data directory."""
         try:
             file_path = os.path.join(DATA_DIR, f"{ticker}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            logger.info(f"Saved data to {file_path}")
+            with span("twitter_client", "serialize"):
+                payload = json.dumps(data, ensure_ascii=False, indent=4)
+
+            def write(tmp_path):
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+
+            # Atomic write on the background writer, so concurrent requests never see a truncated file
+            writer.submit(file_path, write)
+            logger.info(f"Queued save of {file_path}")
         except Exception as e:
             logger.error(f"Error saving data to JSON for ticker {ticker}: {e}")
 
@@ -183,12 +194,11 @@ class TwitterClient:
         
         try:
             tweets = self.search_tweets(query, max_results=max_results)
-            print("tweets",tweets)
+            logger.debug(f"Found {len(tweets) if tweets else 0} tweets for {ticker}")
             if not tweets:
                 # Try loading from saved data if no tweets are found
-                print("loading from saved ones",ticker)
+                logger.debug(f"Loading saved tweets for {ticker}")
                 saved_data = self.load_from_json(ticker)
-                print("saved data",saved_data)
                 if saved_data:
                     return saved_data
                 return {
@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.market_data import market_data
+from src.metrics import record_cache, span
+from src.quarterly_features import FINANCIAL_INDICATORS, get_quarterly_predictions, quarterly_path
+
+logger = logging.getLogger(__name__)
+
+FINANCIAL_SIGNALS_FOLDER = "financial_signals"
+UNIFIED_START_DATE = "2021-01-01"  # Earliest date any caller needs (get_plot_data)
+QUARTERLY_COLUMNS = ["Qavg_Close", "Qstd_Close", "Predicted_Qavg_Close", "Lower_Bound", "Upper_Bound"] + FINANCIAL_INDICATORS
+
+_entries: Dict[str, Dict] = {}  # {company: {"key", "built_on", "daily", "quarters"}}
+_quarter_entries: Dict[str, Dict] = {}  # {company: {"key", "quarters"}}
+_company_locks: Dict[str, threading.RLock] = {}
+_lock = threading.Lock()
+
+
+def _company(ticker: str) -> str:
+    return ticker.split(".")[0]
+
+
+def _yf_ticker(ticker: str) -> str:
+    # Assume NSE if no suffix provided
+    return ticker if ticker.endswith((".NS", ".BO")) else f"{ticker}.NS"
+
+
+def _signals_path(ticker: str) -> str:
+    return os.path.join(FINANCIAL_SIGNALS_FOLDER, f"{_company(ticker)}_predictions_signals.csv")
+
+
+def _mtime(path: str) -> Optional[float]:
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def _wall_dates(index) -> pd.DatetimeIndex:
+    # Quarters and alignment follow the exchange's wall-clock dates
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.normalize()
+
+
+def _quarter_table(ticker: str) -> Optional[pd.DataFrame]:
+    """One row per quarter: fundamentals, predicted range and financial signal, keyed by quarter start."""
+    tables = []
+    if os.path.exists(quarterly_path(ticker)):
+        try:
+            quarterly = get_quarterly_predictions(ticker)[["Quarter"] + QUARTERLY_COLUMNS]
+            tables.append(quarterly.assign(Quarter=quarterly["Quarter"].astype(str)))
+        except Exception as e:
+            logger.warning(f"Quarterly features unavailable for {ticker}: {e}")
+    if os.path.exists(_signals_path(ticker)):
+        try:
+            signals = pd.read_csv(_signals_path(ticker), usecols=["Quarter", "Signal"])
+            tables.append(signals.rename(columns={"Signal": "Financial_Signal"}).astype({"Quarter": str}))
+        except Exception as e:
+            logger.warning(f"Financial signals unavailable for {ticker}: {e}")
+    if not tables:
+        return None
+
+    table = tables[0]
+    for other in tables[1:]:
+        table = table.merge(other, on="Quarter", how="outer")
+    for col in QUARTERLY_COLUMNS + ["Financial_Signal"]:
+        if col not in table.columns:
+            table[col] = np.nan
+    table["Quarter_Start"] = pd.PeriodIndex(table["Quarter"], freq="Q").start_time
+    return table.sort_values("Quarter_Start").reset_index(drop=True)
+
+
+def build_unified_frame(ticker: str, ohlcv_data: pd.DataFrame, quarters: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Join date-indexed daily OHLCV onto the quarter table with one as-of merge."""
+    daily = ohlcv_data.copy()
+    dates = _wall_dates(daily.index)
+    daily["Quarter"] = dates.to_period("Q").astype(str)
+
+    value_columns = QUARTERLY_COLUMNS + ["Financial_Signal"]
+    if quarters is None:
+        for col in value_columns:
+            daily[col] = np.nan
+        return daily
+
+    # Single as-of join of every trading day onto the quarter it falls in
+    days = pd.DataFrame({"Day": dates, "Row": np.arange(len(dates))}).sort_values("Day")
+    merged = pd.merge_asof(days, quarters, left_on="Day", right_on="Quarter_Start", direction="backward")
+    merged = merged.sort_values("Row")
+
+    # A day with no row for its own quarter stays NaN rather than inheriting the previous quarter
+    own_quarter = merged["Quarter"].values == daily["Quarter"].values
+    for col in value_columns:
+        daily[col] = np.where(own_quarter, merged[col].values, np.nan)
+    return daily
+
+
+def _company_lock(company: str) -> threading.RLock:
+    with _lock:
+        return _company_locks.setdefault(company, threading.RLock())
+
+
+def _source_key(ticker: str):
+    return (_mtime(quarterly_path(ticker)), _mtime(_signals_path(ticker)))
+
+
+def get_quarter_table(ticker: str) -> Optional[pd.DataFrame]:
+    """
+    The quarter rows (including the next-quarter forecast) for a ticker,
+    from the local quarterly and financial_signals files only; no prices
+    are fetched. Cached until either file changes; callers must not
+    mutate the returned frame.
+    """
+    company = _company(ticker)
+    key = _source_key(ticker)
+    with _company_lock(company):
+        entry = _quarter_entries.get(company)
+        if entry is not None and entry["key"] == key:
+            record_cache("quarter_tables", "hit")
+            return entry["quarters"]
+        record_cache("quarter_tables", "miss")
+        with span("unified_frame", "quarters"):
+            quarters = _quarter_table(ticker)
+        _quarter_entries[company] = {"key": key, "quarters": quarters}
+        return quarters
+
+
+def _get_entry(ticker: str) -> Dict:
+    company = _company(ticker)
+    key = _source_key(ticker)
+    today = datetime.now().date()
+
+    with _company_lock(company):
+        entry = _entries.get(company)
+        # Rebuilt when the quarterly or signals file changes, and once a day for new prices
+        if entry is not None and entry["key"] == key and entry["built_on"] == today:
+            record_cache("unified_frames", "hit")
+            return entry
+
+        record_cache("unified_frames", "miss")
+        with span("unified_frame", "data_fetch"):
+            ohlcv = market_data.history(_yf_ticker(ticker), start=UNIFIED_START_DATE, end=today.strftime("%Y-%m-%d"))
+        if ohlcv.empty:
+            raise ValueError(f"No daily data found for ticker {_yf_ticker(ticker)} on yfinance")
+        quarters = get_quarter_table(ticker)
+        with span("unified_frame", "build"):
+            daily = build_unified_frame(ticker, ohlcv, quarters)
+        entry = {"key": key, "built_on": today, "daily": daily, "quarters": quarters}
+        _entries[company] = entry
+        return entry
+
+
+def get_unified_frame(ticker: str) -> pd.DataFrame:
+    """
+    Date-indexed daily OHLCV from UNIFIED_START_DATE to today with the
+    quarter's fundamentals, predicted quarterly range
+    (Predicted_Qavg_Close, Lower/Upper_Bound) and Financial_Signal on
+    every row, plus a Quarter column ('2023Q1').
+
+    Built once per ticker over the full range, and again only when the
+    Quartely_merged or financial_signals file changes or the day rolls
+    over; callers slice it (see align_to). The returned frame is shared;
+    callers must copy before mutating it. Callers that already hold the
+    prices they need should use build_unified_frame with
+    get_quarter_table instead of fetching them again.
+    """
+    return _get_entry(ticker)["daily"]
+
+
+def align_to(unified: pd.DataFrame, index) -> pd.DataFrame:
+    """Rows of the unified frame for the trading days in index (matched on date, NaN where missing)."""
+    by_day = unified.set_axis(_wall_dates(unified.index))
+    by_day = by_day[~by_day.index.duplicated(keep="last")]
+    return by_day.reindex(_wall_dates(index)).set_axis(index)
@@ -0,0 +1,13 @@
+import os
+from typing import List
+
+QUARTERLY_FOLDER = os.path.join("data", "Quartely_merged")
+QUARTERLY_SUFFIX = "_Final_merged.csv"
+
+
+def get_universe(exchange_suffix: str = ".NS") -> List[str]:
+    """Tickers covered by the quarterly merged data (e.g. ['ADANIENT.NS', ...])."""
+    if not os.path.isdir(QUARTERLY_FOLDER):
+        return []
+    companies = [f[:-len(QUARTERLY_SUFFIX)] for f in os.listdir(QUARTERLY_FOLDER) if f.endswith(QUARTERLY_SUFFIX)]
+    return [f"{company}{exchange_suffix}" for company in sorted(companies)]
@@ -0,0 +1,165 @@
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting_signals import get_stocks_data
+from src.feature_store import get_indicator_frame
+from src.file_writer import atomic_write
+from src.model_registry import registry
+from src.training_pipeline import TIME_STEPS, init_worker
+from src.universe import get_universe
+
+EVAL_START_DATE = datetime(2021, 7, 7)
+# next_day_pred fits its scalers on a 100-day fetch, which leaves ~50 rows after indicator warm-up
+SCALER_WINDOW = 50
+SIGNAL_THRESHOLD = 0.034  # next_day_pred HOLD band
+PREDICT_BATCH_SIZE = 1024
+OUTPUT_FILE = os.path.join("outputs", "walk_forward_metrics.csv")
+
+
+def load_ohlcv(ticker: str, offline: bool = False) -> pd.DataFrame:
+    """OHLCV history for a ticker, from yfinance or the local data/{ticker}_OHLCV.csv."""
+    if offline:
+        ohlcv_data = pd.read_csv(os.path.join("data", f"{ticker}_OHLCV.csv"))
+        ohlcv_data['Date'] = pd.to_datetime(ohlcv_data['Date'].astype(str).str[:10])  # Drop the exchange UTC offset
+        return ohlcv_data
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    return get_stocks_data(ticker, EVAL_START_DATE, today)
+
+
+def walk_forward_predictions(ticker: str, ohlcv_data: pd.DataFrame, scaler_window: Optional[int] = SCALER_WINDOW) -> pd.DataFrame:
+    """
+    Replay next_day_pred over every day of the history in one batched predict call.
+
+    For each day t the window X[t-9..t] is min-max scaled using only rows up
+    to t (a trailing scaler_window rows, or the whole expanding history when
+    scaler_window is None), so no future data leaks into a prediction. The
+    prediction is compared with the close of day t+1.
+    """
+    company_name = ticker.split(".")[0]
+    model, selected_features = registry.get_model(company_name)
+    stats = registry.get_stats(company_name)
+
+    features = get_indicator_frame(ticker, ohlcv_data, adj_close_first=False)
+    X_df = features.drop(columns=['Close'])
+    close = features['Close']
+    if len(features) <= TIME_STEPS + 1:
+        raise ValueError(f"Input data has {len(features)} rows, but more than {TIME_STEPS + 1} are required.")
+
+    # Scaler bounds known at each day
+    window = scaler_window or len(features)
+    x_min = X_df.rolling(window, min_periods=1).min().values
+    x_max = X_df.rolling(window, min_periods=1).max().values
+    y_min = close.rolling(window, min_periods=1).min().values
+    y_max = close.rolling(window, min_periods=1).max().values
+
+    ends = np.arange(TIME_STEPS - 1, len(features) - 1)
+    idx = ends[:, None] - np.arange(TIME_STEPS)[::-1][None, :]  # (samples, time_steps)
+    X = X_df.values[:, selected_features]
+    lo = x_min[ends][:, selected_features][:, None, :]
+    span = (x_max - x_min)[ends][:, selected_features][:, None, :]
+    span[span == 0] = 1.0  # Same zero-range handling as MinMaxScaler
+    X_seq = (X[idx] - lo) / span
+
+    y_pred_scaled = model.predict(X_seq, batch_size=PREDICT_BATCH_SIZE, verbose=0)[:, -1, 0]
+    y_span = y_max[ends] - y_min[ends]
+    y_span[y_span == 0] = 1.0
+    y_pred = y_pred_scaled * y_span + y_min[ends]
+
+    if stats['Mean_Residuals'] > 0:
+        adjusted_pred = y_pred + stats['Std_Dev']
+    else:
+        adjusted_pred = y_pred - stats['Std_Dev']
+
+    last_close = close.values[ends]
+    signal = np.where(adjusted_pred > last_close, 1, -1)
+    signal[np.abs(adjusted_pred - last_close) <= SIGNAL_THRESHOLD * last_close] = 0
+
+    return pd.DataFrame({
+        'Date': features.index[ends + 1],
+        'Company': company_name,
+        'Last_Close': last_close,
+        'Actual_Close': close.values[ends + 1],
+        'Predicted_Close': y_pred,
+        'Adjusted_Predicted_Close': adjusted_pred,
+        'Signal': signal,
+    })
+
+
+def summarize(predictions: pd.DataFrame) -> pd.DataFrame:
+    """RMSE, MAE, directional accuracy and signal hit rate per company and quarter (plus an 'ALL' row)."""
+    df = predictions.copy()
+    dates = pd.to_datetime(df['Date'])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    df['Quarter'] = dates.dt.to_period('Q').astype(str)
+    df['Error'] = df['Actual_Close'] - df['Predicted_Close']
+    actual_move = np.sign(df['Actual_Close'] - df['Last_Close'])
+    df['Direction_Hit'] = np.sign(df['Adjusted_Predicted_Close'] - df['Last_Close']) == actual_move
+    df['Signal_Hit'] = (df['Signal'] == actual_move).astype(float).where(df['Signal'] != 0)
+
+    def _metrics(group):
+        return pd.Series({
+            'N': len(group),
+            'RMSE': float(np.sqrt(np.mean(group['Error'] ** 2))),
+            'MAE': float(np.mean(np.abs(group['Error']))),
+            'Directional_Accuracy': float(group['Direction_Hit'].mean()),
+            'N_Signals': int(group['Signal_Hit'].notna().sum()),
+            'Signal_Hit_Rate': float(group['Signal_Hit'].mean()) if group['Signal_Hit'].notna().any() else None,
+        })
+
+    per_quarter = df.groupby(['Company', 'Quarter']).apply(_metrics, include_groups=False).reset_index()
+    overall = df.groupby('Company').apply(_metrics, include_groups=False).reset_index()
+    overall.insert(1, 'Quarter', 'ALL')
+    return pd.concat([per_quarter, overall], ignore_index=True)
+
+
+def evaluate_company(ticker: str, offline: bool = False, scaler_window: Optional[int] = SCALER_WINDOW) -> pd.DataFrame:
+    """Walk-forward metrics for one ticker (runs in a worker process)."""
+    ohlcv_data = load_ohlcv(ticker, offline=offline)
+    return summarize(walk_forward_predictions(ticker, ohlcv_data, scaler_window=scaler_window))
+
+
+def run_evaluation(tickers: Optional[List[str]] = None, workers: Optional[int] = None, offline: bool = False,
+                   scaler_window: Optional[int] = SCALER_WINDOW, output_file: str = OUTPUT_FILE) -> pd.DataFrame:
+    """Evaluate many tickers across a process pool and write the combined metrics CSV."""
+    tickers = tickers or get_universe()
+    workers = workers or os.cpu_count() or 1
+    results = []
+    ctx = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init_worker) as executor:
+        futures = {executor.submit(evaluate_company, ticker, offline, scaler_window): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results.append(future.result())
+                print(f"Evaluated {ticker}")
+            except Exception as e:
+                print(f"Error evaluating {ticker}: {e}")
+
+    metrics = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    if not metrics.empty:
+        metrics = metrics.sort_values(['Company', 'Quarter'], ignore_index=True)
+    atomic_write(output_file, lambda tmp_path: metrics.to_csv(tmp_path, index=False))
+    print(f"Walk-forward metrics saved to {output_file}")
+    return metrics
+
+
+if __name__ == "__main__":
+    # Run from backend/: python -m src.walk_forward --workers 8
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of next_day_pred across the universe")
+    parser.add_argument("--tickers", nargs="*", help="Tickers to evaluate (default: the Quartely_merged universe)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--offline", action="store_true", help="Use data/{ticker}_OHLCV.csv instead of yfinance")
+    parser.add_argument("--expanding", action="store_true", help="Scale on the full history up to each day")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    run_evaluation(args.tickers, workers=args.workers, offline=args.offline,
+                   scaler_window=None if args.expanding else SCALER_WINDOW, output_file=args.output)
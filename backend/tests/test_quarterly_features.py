@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from src import quarterly_features
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKER = "RELIANCE.NS"
+FIXTURE = os.path.join(BACKEND_DIR, "data", "Quartely_merged", "RELIANCE_Final_merged.csv")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Empty caches, no disk persistence, and a scratch copy of the merged CSV."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(quarterly_features, "_materialized", {})
+    monkeypatch.setattr(quarterly_features, "_persist", lambda company, entry: None)
+    events = []
+    monkeypatch.setattr(quarterly_features, "record_cache", lambda cache, result: events.append(result))
+    path = tmp_path / "RELIANCE_Final_merged.csv"
+    shutil.copy(FIXTURE, path)
+    return str(path), pd.read_csv(FIXTURE), events
+
+
+def _write(path, df, mtime):
+    # Explicit, increasing mtimes: the cache is keyed on them and filesystems may round to seconds
+    df.to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def _historical(frame):
+    return frame.iloc[:-1].reset_index(drop=True)  # Drop the next-quarter forecast row
+
+
+def test_appended_quarter_keeps_existing_rows(workspace):
+    path, raw, events = workspace
+    _write(path, raw.iloc[:-1], 1_000_000)
+    before = quarterly_features.get_quarterly_predictions(TICKER, path)
+    model = quarterly_features._materialized["RELIANCE"]["model"]
+
+    _write(path, raw, 1_000_100)
+    after = quarterly_features.get_quarterly_predictions(TICKER, path)
+
+    assert events == ["miss", "incremental"]
+    assert quarterly_features._materialized["RELIANCE"]["model"] is model
+    assert len(after) == len(before) + 1
+    pd.testing.assert_frame_equal(_historical(after).iloc[:len(before) - 1], _historical(before))
+
+
+def test_edited_history_refits(workspace):
+    path, raw, events = workspace
+    _write(path, raw, 1_000_000)
+    quarterly_features.get_quarterly_predictions(TICKER, path)
+    model = quarterly_features._materialized["RELIANCE"]["model"]
+
+    edited = raw.copy()
+    edited.loc[2, "Net Profit"] = edited.loc[2, "Net Profit"] * 2
+    _write(path, edited, 1_000_100)
+    after = quarterly_features.get_quarterly_predictions(TICKER, path)
+
+    assert events == ["miss", "miss"]
+    assert quarterly_features._materialized["RELIANCE"]["model"] is not model
+    # The edited quarter feeds the lagged features of the next one
+    lagged = after.loc[after["Quarter"].astype(str) == edited.loc[3, "Quarter"], "Lagged_Net Profit"]
+    assert lagged.iloc[0] == pytest.approx(edited.loc[2, "Net Profit"])
+
+
+def test_touched_but_unchanged_file_is_a_hit(workspace):
+    path, raw, events = workspace
+    _write(path, raw, 1_000_000)
+    before = quarterly_features.get_quarterly_predictions(TICKER, path)
+
+    os.utime(path, (1_000_100, 1_000_100))
+    after = quarterly_features.get_quarterly_predictions(TICKER, path)
+
+    assert events == ["miss", "hit"]
+    pd.testing.assert_frame_equal(after, before)
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import unified_frame
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKER = "HDFCBANK.NS"
+SIGNALS_FIXTURE = os.path.join(BACKEND_DIR, "financial_signals", "HDFCBANK_predictions_signals.csv")
+MISSING_QUARTER = "2022Q2"
+
+
+def _old_quarter(date):
+    # get_quarter from the pre-unified-frame technical_predictions
+    return f"{date.year}Q{(date.month - 1) // 3 + 1}"
+
+
+@pytest.fixture
+def signals(tmp_path, monkeypatch):
+    """Signals fixture with one quarter removed, served from a scratch financial_signals/ folder."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(unified_frame, "_quarter_entries", {})
+    df = pd.read_csv(SIGNALS_FIXTURE)
+    df = df[df["Quarter"] != MISSING_QUARTER]
+    os.makedirs(unified_frame.FINANCIAL_SIGNALS_FOLDER)
+    df.to_csv(os.path.join(unified_frame.FINANCIAL_SIGNALS_FOLDER, "HDFCBANK_predictions_signals.csv"), index=False)
+    return dict(zip(df["Quarter"], df["Signal"]))
+
+
+def _ohlcv(index):
+    close = np.linspace(1500, 1700, len(index))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1000}, index=index)
+
+
+def _expected(index, signals):
+    return np.array([signals.get(_old_quarter(date), np.nan) for date in index], dtype=float)
+
+
+def test_signal_per_day_matches_quarter_lookup(signals):
+    # Starts before the first signal quarter and spans the removed one
+    index = pd.bdate_range("2021-05-03", "2024-12-31", name="Date").tz_localize("Asia/Kolkata")
+    unified = unified_frame.build_unified_frame(TICKER, _ohlcv(index), unified_frame.get_quarter_table(TICKER))
+
+    np.testing.assert_array_equal(unified["Financial_Signal"].values.astype(float), _expected(index, signals))
+    # Days of the removed quarter stay NaN instead of inheriting the previous quarter's signal
+    assert unified.loc[unified["Quarter"] == MISSING_QUARTER, "Financial_Signal"].isna().all()
+
+
+def test_align_to_tz_aware_subset(signals):
+    index = pd.bdate_range("2021-05-03", "2024-12-31", name="Date").tz_localize("Asia/Kolkata")
+    unified = unified_frame.build_unified_frame(TICKER, _ohlcv(index), unified_frame.get_quarter_table(TICKER))
+
+    subset = index[::7]
+    aligned = unified_frame.align_to(unified, subset)
+
+    assert aligned.index.equals(subset)
+    np.testing.assert_array_equal(aligned["Financial_Signal"].values.astype(float), _expected(subset, signals))